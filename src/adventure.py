@@ -213,9 +213,7 @@ def run_adventure_streaming():
         "precursor": precursor,
         "items": items # 獲得アイテムを追加
     }
-    current_usage_data = file_handler.load_usage_data() # usage_dataをロード
-    current_usage_data["adventure_history"].append(adventure_entry)
-    file_handler.save_usage_data(current_usage_data) # usage_dataを保存
+    file_handler.add_adventure_history(adventure_entry) # 新しい順を保ったまま保存
 
     hours, remainder = divmod(total_time.total_seconds(), 3600)
     minutes = remainder // 60
@@ -7,6 +7,7 @@ import streamlit as st
 import graphviz
 
 from src.utils.file_handler import FileHandler, FileStructure
+from src.ui.styles import TOOLTIP_CSS
 from src.utils.config import ConfigManager
 from adventure import run_adventure_streaming, ADVENTURE_COST, INTERVAL_MINUTES, LONG_INTERVAL_MINUTES
 from pathlib import Path
@@ -19,6 +20,16 @@ file_structure = FileStructure(
 )
 file_handler = FileHandler(file_structure, config_manager)
 
+# 過去の冒険の数値表示と、サイドバーの行間の調整
+_APP_CSS = """
+    <style>
+    [data-testid="stMetricValue"] { font-size: 150%; }
+    div.stHorizontalBlock {
+        margin-bottom: 0px;
+    }
+    </style>
+"""
+
 
 # ロケール設定
 locale.setlocale(locale.LC_TIME, 'ja_JP.UTF-8')
@@ -134,28 +145,14 @@ def count_changes(seq):
 def display_past_adventure(entry, terms_dict):
     """過去の冒険詳細を表示"""
 
-    # スタイル適用 (CSSを関数内で定義)
-    st.markdown(
-        """
-        <style>
-        [data-testid="stMetricValue"] { font-size: 150%; }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    adventure_file = file_handler.get_adventure_path(entry['area'], entry['adventure'])
-    if not adventure_file.exists():
-        st.error("冒険記録ファイルが見つかりません")
-        return
-
+    # 存在確認の stat を挟まず、読み込み側でファイルがないことを判定する
     try:
-        with adventure_file.open("r", encoding="utf-8") as f:
-            adventure_log_content = f.read()
-        location_history_path = file_handler.get_location_path(entry['area'], entry['adventure'])
-        if location_history_path.exists():
-            with location_history_path.open("r", encoding="utf-8") as f:
-                location_history = [loc.strip() for loc in f.readlines() if loc.strip()]
+        adventure_log_content = file_handler.read_text(file_handler.get_adventure_path(entry['area'], entry['adventure']))
+        if adventure_log_content is None:
+            st.error("冒険記録ファイルが見つかりません")
+            return
+        location_text = file_handler.read_text(file_handler.get_location_path(entry['area'], entry['adventure']))
+        location_history = [loc for loc in map(str.strip, location_text.splitlines()) if loc] if location_text else []
         items = entry.get("items", [])
     except Exception as e:
         st.error(f"ファイル読み込みエラー: {str(e)}")
@@ -321,35 +318,8 @@ def show_home(adventure_history, terms_dict):
 
 def main():
     """メイン関数： Streamlitアプリケーションの実行ロジック"""
-    # カスタムツールチップ用のCSS
-    st.markdown("""
-    <style>
-    .tooltip-span {
-        position: relative;
-    }
-
-    .tooltip-span:hover::after {
-        content: attr(data-tooltip);
-        position: absolute;
-        bottom: 100%;
-        left: 0;              /* 親要素左端に合わせる */
-
-        width: 250px;         /* 横幅を固定 */
-        white-space: normal;  /* 折り返しOK */
-        
-        padding: 6px 10px;
-        border-radius: 6px;
-        background-color: #333;
-        color: #fff;
-        font-size: 0.85em;
-        z-index: 1000;
-        box-sizing: border-box;
-
-        word-break: break-word;    /* 長い単語も途中で折り返す */
-        overflow-wrap: break-word; /* 補助的に折り返し */
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # ページで使うCSSは、描画の途中で何度も送らないよう最初にまとめて入れる
+    st.markdown(TOOLTIP_CSS + _APP_CSS, unsafe_allow_html=True)
     usage_data = file_handler.load_usage_data()
     adventure_history = usage_data.get("adventure_history", [])
     st.cache_data.clear() # キャッシュをクリア
@@ -372,15 +342,6 @@ def main():
             st.query_params.clear()
             st.rerun()
 
-        # CSSでマージンとパディングを調整
-        st.markdown("""
-        <style>
-        div.stHorizontalBlock {
-            margin-bottom: 0px;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-
 
         current_balance = file_handler.load_usage_data().get("balance", 0)
         st.subheader(f"所持金: 🪙 {current_balance}")
@@ -75,5 +75,5 @@ class AreaChecker(ContentChecker):
             raise ValueError("resultsに 'area_name' キーが含まれている必要があります。")
         area_name = results["area_name"]
         csv_row = self._format_csv_row(area_name, results)
-        self.csv_handler.write_row(csv_path, csv_row, headers=["エリア名"] + self.check_keys)
+        self.csv_handler.write_row(csv_path, csv_row, headers=["エリア名", *self.check_keys])
         self.csv_handler.sort_by_result(csv_path)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import re
 from abc import ABC
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from pathlib import Path
 import json
 import json5
@@ -9,11 +9,11 @@ from src.core.client import BaseClient, ResponseFormat
 from src.utils.csv_handler import CSVHandler
 
 class ContentChecker(ABC):
-    def __init__(self, client: BaseClient, template_path: Optional[Path], check_keys: List, check_marks: str):
+    def __init__(self, client: BaseClient, template_path: Optional[Path], check_keys: Sequence[str], check_marks: str):
         self.client = client
         self.json_pattern = re.compile(r"```json\n(.*?)```", re.DOTALL)
         self.template = self._load_template(template_path)
-        self.check_keys = check_keys
+        self.check_keys = tuple(check_keys)
         self.check_marks = check_marks
         self.csv_handler = CSVHandler()
 
@@ -90,7 +90,7 @@ class ContentChecker(ABC):
             raise ValueError("resultsに 'adventure_name' キーが含まれている必要があります。")
         adventure_name = results["adventure_name"]
         csv_row = self._format_csv_row(adventure_name, results)
-        self.csv_handler.write_row(csv_path, csv_row, headers=["冒険名"] + self.check_keys)
+        self.csv_handler.write_row(csv_path, csv_row, headers=["冒険名", *self.check_keys])
         self.csv_handler.sort_by_result(csv_path)
 
     def _format_csv_row(self, name: str, content: Dict) -> List[str]:
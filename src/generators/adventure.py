@@ -8,6 +8,7 @@ from src.core.client import ResponseFormat
 from src.generators.extract import ImpactData
 from src.utils.csv_handler import CSVHandler
 
+_REQUIRED_CHAPTER_KEYS = frozenset({"number", "title", "content"})
 
 @dataclass
 class Item:
@@ -198,13 +199,13 @@ class AdventureGenerator(ContentGenerator):
             raise ValueError("itemは配列ではなく文字列")
         if res == "失敗" and item != "None":
             raise ValueError("失敗ではitemは空である必要があります")
+        find_ng_word = self.config.ng_word_matcher.find
         for i, chapter in enumerate(filtered, 1):
-            required_keys = {"number", "title", "content"}
-            missing_keys = required_keys - chapter.keys()
-            if missing_keys:
-                raise ValueError(f"第{i}章にキーが不足しています: {missing_keys}")
-            content_text = chapter.get("content")
-            if set(self.config.ng_words).intersection(content_text.split()):
+            # 通常はキーがそろっているので、差集合はエラーのときだけ作る
+            if not _REQUIRED_CHAPTER_KEYS.issubset(chapter):
+                raise ValueError(f"第{i}章にキーが不足しています: {_REQUIRED_CHAPTER_KEYS - chapter.keys()}")
+            content_text = chapter["content"]
+            if find_ng_word(content_text):
                 raise ValueError(f"第{i}章にNGワードが含まれています: {content_text}")
         content["chapters"] = filtered
 
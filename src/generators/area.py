@@ -6,7 +6,11 @@ from src.core.generator import ContentGenerator
 from src.core.client import ResponseFormat
 from src.utils.csv_handler import CSVHandler
 from src.utils.retry import retry_on_failure
+from src.utils.substring_matcher import SubstringMatcher
 
+# エリア名に使えない文字。削除用の変換表にしておき、translate で一度に調べる
+_INVALID_AREA_NAME_CHARS = '~〜〰|[]「」『』:;@/> 　・･'
+_INVALID_AREA_NAME_TABLE = str.maketrans('', '', _INVALID_AREA_NAME_CHARS)
 
 @dataclass
 class AreaData:
@@ -35,6 +39,10 @@ class AreaGenerator(ContentGenerator):
         self.past_areas_csv_path = past_areas_csv_path
         self.config = config
         self.areas = self._load_existing_areas()
+        # 既存のエリア名・財宝名との重複チェックは、候補ごとに全件を回さず1回の走査で済ませる
+        self._area_name_matcher = SubstringMatcher(self.areas)
+        self._treasure_matcher = SubstringMatcher(area.treasure for area in self.areas.values())
+        self._existing_treasures_text = "\0".join(area.treasure for area in self.areas.values())
 
     def _load_existing_areas(self) -> Dict[str, AreaData]:
         areas_data = {}
@@ -145,29 +153,24 @@ class AreaGenerator(ContentGenerator):
             # NGワードチェック
             for field in self.config.csv_headers_area: # 全フィールドをチェック
                 value = str(content.get(field, '')) # エラーを防ぐため get を使用し、文字列に変換
-                if set(self.config.ng_words).intersection(value.split()):
+                if self.config.ng_word_matcher.find(value):
                     raise ValueError(f"NGワードが含まれています: {field} - {value}")
 
             # エリア名のバリデーション
             areaname = content["エリア名"]
-            for invalid_char in {'~', '〜', '〰', '|', '[', ']', '「', '」', '『', '』', ':', ';', '@', '/', '>', ' ', '　', '・', '･'}:
-                if invalid_char in areaname:
-                    raise ValueError(f"エリア名に禁止文字{invalid_char}が含まれています: {areaname}")
+            if areaname.translate(_INVALID_AREA_NAME_TABLE) != areaname:
+                invalid_char = next(char for char in areaname if char in _INVALID_AREA_NAME_CHARS)
+                raise ValueError(f"エリア名に禁止文字{invalid_char}が含まれています: {areaname}")
 
             # エリア名の重複チェック
-            existing_areas = list(self.areas.keys())
-            for area in existing_areas:
-                if area in areaname:
-                    raise ValueError(f"エリア名が既存のエリア名と重複しています: {areaname}")
-            if areaname in existing_areas:
+            if areaname in self.areas or self._area_name_matcher.find(areaname):
                 raise ValueError(f"エリア名が既存のエリア名と重複しています: {areaname}")
 
             # 財宝名のバリデーション
             treasure = content["財宝"]["名称"]
-            for area in self.areas.values():
-                existing_treasure = area.treasure
-                if existing_treasure in treasure or treasure in existing_treasure:
-                    raise ValueError(f"財宝名が既存の財宝名と重複しています: {treasure}")
+            # 既存の財宝名を含む場合と、既存の財宝名に含まれる場合の両方を重複とみなす
+            if self._treasure_matcher.find(treasure) or (self.areas and treasure in self._existing_treasures_text):
+                raise ValueError(f"財宝名が既存の財宝名と重複しています: {treasure}")
         except ValueError as e:
             print(f"バリデーションエラー: {e}")
             raise e
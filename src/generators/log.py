@@ -1,18 +1,37 @@
 import re
 from typing import Dict, Optional
 from pathlib import Path
-from collections import defaultdict
 
 from src.core.generator import ContentGenerator
 from src.core.client import ResponseFormat
 from src.utils.csv_handler import CSVHandler
 
+# 許可されているプレースホルダー（行ごとに作り直さないようモジュールで持つ）
+_ALLOWED_PLACEHOLDERS = frozenset({"name", "precursor"})
+_PLACEHOLDER_PATTERN = re.compile(r'{(.*?)}')
+# 話のつながりを見るための内容語（2文字以上の漢字・カタカナの並び）。ひらがなや句読点は文末表現ばかり重なるので除く
+_CONTENT_TOKEN_PATTERN = re.compile(r'[\u4e00-\u9fff々]{2,}|[\u30a1-\u30faー]{2,}')
+
+
+class _PlaceholderDefaults(dict):
+    # defaultdict と違い、未知のキーを参照しても自分自身には追加しない
+    def __missing__(self, key):
+        return ""
+
+
+_PLACEHOLDER_DEFAULTS = _PlaceholderDefaults(name="テスト", precursor="テスト")
+
+
+def _content_tokens(text: str) -> set:
+    return set(_CONTENT_TOKEN_PATTERN.findall(_PLACEHOLDER_PATTERN.sub('', text)))
+
+
 class LogGenerator(ContentGenerator):
     def __init__(self, client, template_path: Path, areas_csv_paths: Path, config_manager):
         super().__init__(client, template_path)
-        self.csv_handler = CSVHandler()
         self.areas_csv_paths = areas_csv_paths
         self.config_manager = config_manager
+        self.csv_handler = CSVHandler(trusted_fast_path=config_manager.csv_trusted_fast_path)
         self.areas = self._load_area_data()
         self.line_pattern = re.compile(r'^\d+\.\s(.*)', re.DOTALL)
 
@@ -54,15 +73,22 @@ class LogGenerator(ContentGenerator):
             next_chapter_text = "（次章はなく、物語はこの章で終わる。）"
         return chapter_text, next_chapter_text
 
+    def _chapter_setting(self, chapter_index: int) -> Dict:
+        settings = self.config_manager.chapter_settings
+        return settings[min(chapter_index, len(settings) - 1)] if settings else {}
+
+    def uses_previous_log(self, chapter_index: int) -> bool:
+        # 章設定で "uses_previous_log": false とした章は前章のログなしで生成できる
+        return chapter_index != 0 and self._chapter_setting(chapter_index).get("uses_previous_log", True)
+
     def _build_kwargs(self, chapter_text: str, next_chapter_text: str, previous_log: str,
                          chapter_index: int, area_info, precursor_log) -> dict:
-        if chapter_index != 0 and previous_log:
+        if previous_log and self.uses_previous_log(chapter_index):
             before_log = self.config_manager.before_log_template["with_pre_log"].format(pre_log=previous_log)
         else:
             before_log = self.config_manager.before_log_template["default"]
         area_info_text, are_info_added = self._format_area_info_text(chapter_text, area_info)
-        settings = self.config_manager.chapter_settings or []
-        thischapter_setting = settings[min(chapter_index, len(settings) - 1)] if settings else {}
+        thischapter_setting = self._chapter_setting(chapter_index)
         end_of_story = next_chapter_text == "（次章はなく、物語はこの章で終わる。）"
         after_chapter = thischapter_setting.get("after_chapter", "")
         if end_of_story:
@@ -99,6 +125,25 @@ class LogGenerator(ContentGenerator):
         self.validate_content(content)
         return self.create_data(content)
 
+    def generate_log_speculative(self, area_name: str, adventure_name: str, chapter_index: int,
+                    area_csv_path: str, provisional_previous: str, precursor_log: str = None, debug: bool = False) -> str:
+        # 前章のログが出来る前に、前章の概要を仮の前ログとして次章を生成する
+        return self.generate_log(area_name, adventure_name, chapter_index, area_csv_path,
+                                 previous_log=provisional_previous, precursor_log=precursor_log, debug=debug)
+
+    @staticmethod
+    def is_continuous(previous_content: str, content: str, min_overlap: float = 0.2) -> bool:
+        """前章末尾と次章冒頭の3行で内容語がどれだけ重なるかで、話がつながっているかを簡易判定する。
+
+        場所・物・出来事の語が1つも重ならなければつながっていないとみなす。
+        見落としても逐次生成でやり直すだけなので、迷う場合は不一致に倒す。
+        """
+        tail = _content_tokens("\n".join(previous_content.splitlines()[-3:]))
+        head = _content_tokens("\n".join(content.splitlines()[:3]))
+        if not tail or not head:
+            return False
+        return len(tail & head) / min(len(tail), len(head)) >= min_overlap
+
     def extract_content(self, response: str) -> str:
         filtered_lines = []
         for line in response.strip().splitlines():
@@ -113,15 +158,12 @@ class LogGenerator(ContentGenerator):
 
     def validate_placeholders(self, line):
         # プレースホルダーの一覧を抽出（例: {name}, {precursor}, {something_else}）
-        placeholders = re.findall(r'{(.*?)}', line)
-
-        # 許可されているプレースホルダー
-        allowed = {"name", "precursor"}
-        line.format_map(defaultdict(str, name="テスト", precursor="テスト"))
+        placeholders = _PLACEHOLDER_PATTERN.findall(line)
+        line.format_map(_PLACEHOLDER_DEFAULTS)
 
         # 許可されていないものが含まれていればエラーを出す
         for ph in placeholders:
-            if ph not in allowed:
+            if ph not in _ALLOWED_PLACEHOLDERS:
                 raise ValueError(f"無効なプレースホルダー '{{{ph}}}' が含まれています: {line}")
 
     def validate_content(self, content: str):
@@ -129,10 +171,20 @@ class LogGenerator(ContentGenerator):
             raise ValueError("抽出されたコンテンツが空です。")
 
         lines = content.splitlines()
+        # 本文全体を1回だけ走査し、見つかったときだけ該当行を探してメッセージに出す
+        ng_word = self.config_manager.ng_word_matcher.find(content)
+        if ng_word:
+            line = next(line for line in lines if ng_word in line)
+            raise ValueError(f"NGワードが含まれています: {line}")
+        # プレースホルダーは本文全体で1回だけ抽出し、許可外があったときだけ該当行を探す
+        # (パターンは改行をまたがないので、行ごとに抽出した結果の和と同じになる)
+        if not _ALLOWED_PLACEHOLDERS.issuperset(_PLACEHOLDER_PATTERN.findall(content)):
+            for line in lines:
+                self.validate_placeholders(line)
+        # 書式の検査は波括弧を含む行だけでよい
         for line in lines:
-            if set(self.config_manager.ng_words).intersection(line.strip()):
-                raise ValueError(f"NGワードが含まれています: {line}")
-            self.validate_placeholders(line)
+            if "{" in line or "}" in line:
+                line.format_map(_PLACEHOLDER_DEFAULTS)
         if len(lines) < 20:
             raise ValueError("抽出されたコンテンツの行数が20行未満です。")
 
@@ -2,6 +2,7 @@ import streamlit as st
 from typing import Optional
 
 from src.ui.views import AreaListView, AreaDetailView, AdventureDetailView
+from src.ui.styles import COMPLETE_PROGRESS_CSS, TOOLTIP_CSS
 from src.ui.navigation import SidebarNavigation
 
 class UIController:
@@ -24,45 +25,29 @@ class UIController:
             layout="wide",
         )
         self._inject_tooltip_css()
+        self._inject_progress_css()
 
-    def _inject_tooltip_css(self):
-        st.markdown("""
-            <style>
-            .tooltip-span {
-                position: relative;
-            }
-
-            .tooltip-span:hover::after {
-                content: attr(data-tooltip);
-                position: absolute;
-                bottom: 100%;
-                left: 0;              /* 親要素左端に合わせる */
-
-                width: 250px;         /* 横幅を固定 */
-                white-space: normal;  /* 折り返しOK */
-                
-                padding: 6px 10px;
-                border-radius: 6px;
-                background-color: #333;
-                color: #fff;
-                font-size: 0.85em;
-                z-index: 1000;
-                box-sizing: border-box;
+    def _inject_progress_css(self):
+        # 進捗バーごとではなく、ページにつき1回だけスタイルを入れる
+        st.markdown(COMPLETE_PROGRESS_CSS, unsafe_allow_html=True)
 
-                word-break: break-word;    /* 長い単語も途中で折り返す */
-                overflow-wrap: break-word; /* 補助的に折り返し */
-            }
-            </style>
-        """, unsafe_allow_html=True)
+    def _inject_tooltip_css(self):
+        st.markdown(TOOLTIP_CSS, unsafe_allow_html=True)
 
-    @st.cache_data(max_entries=10)
+    # エリア一覧は読み取り専用で使うので、再実行のたびに pickle からコピーし直さず同じオブジェクトを共有する
+    @st.cache_resource(max_entries=10)
     def load_areas_csv(_self):
         return _self.file_handler.load_areas_csv()
 
-    @st.cache_data(max_entries=10)
+    @st.cache_resource(max_entries=10)
     def load_all_lv_area_dict(_self):
         return _self.file_handler.load_all_lv_area_dict()
 
+    @st.cache_resource(max_entries=10)
+    def load_sorted_lv_area_names(_self):
+        # サイドバーはフィルタ入力のたびに描画し直すので、並べ替えはここで1回だけ行う
+        return {lv: sorted(lv_df["エリア名"].to_list()) for lv, lv_df in _self.load_all_lv_area_dict().items()}
+
     def run(self):
         self.initialize()
 
@@ -81,13 +66,11 @@ class UIController:
                         st.rerun()
 
         areas_df = self.load_areas_csv()
-        all_lv_area_dict = self.load_all_lv_area_dict()
-    
         if areas_df is None:
             st.error("エリア一覧データが見つかりません。")
             return
 
-        lv_area_names = {lv: lv_df["エリア名"].to_list() for lv, lv_df in all_lv_area_dict.items()}
+        lv_area_names = self.load_sorted_lv_area_names()
         self.navigation.render(lv_area_names)
         self._render_view(st.query_params.get("area", "エリア一覧"),
                         st.query_params.get("adv", None),
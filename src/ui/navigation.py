@@ -1,5 +1,8 @@
 import streamlit as st
 from typing import Dict
+from urllib.parse import quote
+
+from src.utils.progress import clear_progress_cache
 
 class SidebarNavigation:
     def __init__(self, file_handler, progress_tracker):
@@ -15,6 +18,8 @@ class SidebarNavigation:
     def _render_refresh_button(self):
         if st.button("🔄 データ更新"):
             st.cache_data.clear()
+            st.cache_resource.clear()
+            clear_progress_cache()
             st.rerun()
 
     def _render_area_list_link(self):
@@ -23,6 +28,8 @@ class SidebarNavigation:
             unsafe_allow_html=True
         )
 
+    # フィルタ入力で再実行されるのはサイドバーのエリア一覧だけにする
+    @st.fragment
     def _render_area_filter(self, lv_area_names: Dict):
         filter_keyword = st.text_input(
             "🔎 エリア名でフィルタ", "", 
@@ -31,31 +38,37 @@ class SidebarNavigation:
         )
         
         filtered_areas = self._filter_areas(lv_area_names, filter_keyword)
+        area_dirs = self.file_handler.list_area_dirs()
 
         for lv, area_names in filtered_areas.items():
-            completed_areas = [area for area in area_names if self.progress_tracker.is_area_complete(area) and self.progress_tracker.is_area_all_checked(area)]
+            completed_areas = [area for area in area_names if self.progress_tracker.area_state(area)[1]]
             with st.expander(f"{lv} ({len(completed_areas)}/{len(area_names)})", expanded=True):
-                for area in sorted(area_names):
-                    label = self._generate_area_label(area)
-                    if self.file_handler.area_exists(area):
-                        st.caption(
-                            f'<a href="?area={area}" target="_self">{label}</a>',
-                            unsafe_allow_html=True
-                        )
+                # エリアごとに要素を作らず、1つの st.caption に改行でまとめて送る
+                lines = []
+                # area_names は呼び出し側で並べ替え済みで、フィルタしても順序は変わらない
+                for area in area_names:
+                    if area in area_dirs and self.progress_tracker.area_exists(area):
+                        label = self._generate_area_label(area)
+                        lines.append(f'<a href="?area={quote(area)}" target="_self">{label}</a>')
                     else:
-                        st.caption(area)
+                        lines.append(area)
+                if lines:
+                    st.caption("  \n".join(lines), unsafe_allow_html=True)
 
     def _filter_areas(self, lv_area_names: Dict, keyword: str) -> Dict:
         if not keyword:
             return lv_area_names
-        filtered_areas = {}
-        for lv, area_names in lv_area_names.items():
-            filtered_areas[lv] = [area for area in area_names if keyword.lower() in area.lower()]
-        return filtered_areas
+        # 入力のたびに呼ばれるので、キーワードの小文字化はループの外で1回だけ行う
+        keyword = keyword.lower()
+        return {
+            lv: [area for area in area_names if keyword in area.lower()]
+            for lv, area_names in lv_area_names.items()
+        }
 
     def _generate_area_label(self, area: str) -> str:
-        if self.progress_tracker.is_area_complete(area):
-            if self.progress_tracker.is_area_all_checked(area):
+        complete, all_checked = self.progress_tracker.area_state(area)
+        if complete:
+            if all_checked:
                 return f"✅{area}"
             return f"🚧{area}"
         return area
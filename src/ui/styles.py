@@ -0,0 +1,39 @@
+# term_to_html が出力する tooltip-span 用のCSS。ページにつき1回 st.markdown で入れる
+TOOLTIP_CSS = """
+    <style>
+    .tooltip-span {
+        position: relative;
+    }
+
+    .tooltip-span:hover::after {
+        content: attr(data-tooltip);
+        position: absolute;
+        bottom: 100%;
+        left: 0;              /* 親要素左端に合わせる */
+
+        width: 250px;         /* 横幅を固定 */
+        white-space: normal;  /* 折り返しOK */
+        
+        padding: 6px 10px;
+        border-radius: 6px;
+        background-color: #333;
+        color: #fff;
+        font-size: 0.85em;
+        z-index: 1000;
+        box-sizing: border-box;
+
+        word-break: break-word;    /* 長い単語も途中で折り返す */
+        overflow-wrap: break-word; /* 補助的に折り返し */
+    }
+    </style>
+"""
+
+# 完了した進捗バーを囲むコンテナの key の接頭辞
+COMPLETE_PROGRESS_KEY = "progress_complete"
+COMPLETE_PROGRESS_CSS = f"""
+    <style>
+    [class*="st-key-{COMPLETE_PROGRESS_KEY}"] .stProgress > div > div > div > div {{
+        background-color: #03C03C;
+    }}
+    </style>
+"""
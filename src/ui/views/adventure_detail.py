@@ -2,17 +2,20 @@ import streamlit as st
 
 from ..views.base import BaseView
 
+# これより大きい冒険テキストは、開いたときにだけ行番号付きの本文を組み立てる
+LARGE_CONTENT_CHARS = 1024 * 1024
+
 class AdventureDetailView(BaseView):
     def render(self, area_name: str, adventure_name: str):
         st.title(f"{area_name} - {adventure_name} 詳細")
 
-        adventures_df = self.load_area_csv(area_name)
+        adventures_df = self.load_indexed_area_csv(area_name)
         is_rendered_adv = self._render_row(adventures_df, adventure_name, "冒険サマリー", area_name)
 
-        log_check_df = self.load_check_csv(area_name, "log")
+        log_check_df = self.load_indexed_check_csv(area_name, "log")
         is_rendered_logcheck = self._render_row(log_check_df, adventure_name, "ログチェック")
 
-        location_check_df = self.load_check_csv(area_name, "loc")
+        location_check_df = self.load_indexed_check_csv(area_name, "loc")
         is_rendered_loccheck = self._render_row(location_check_df, adventure_name, "位置情報チェック")
         
         if not is_rendered_adv and not is_rendered_logcheck and not is_rendered_loccheck:
@@ -26,11 +29,10 @@ class AdventureDetailView(BaseView):
 
     def _render_items_section(self, area_name: str, adventure_name: str):
         st.markdown("**獲得アイテム**")
-        area_df = self.load_area_csv(area_name)
+        area_df = self.load_indexed_area_csv(area_name)
         if area_df is not None:
-            adventure_row = area_df[area_df["冒険名"] == adventure_name]
-            if not adventure_row.empty:
-                item_name = adventure_row["アイテム"].iloc[0]
+            if adventure_name in area_df.index:
+                item_name = area_df.loc[[adventure_name], "アイテム"].iloc[0]
                 if item_name:
                     desc = self.file_handler.get_item_description(item_name)
                     if desc:
@@ -44,10 +46,26 @@ class AdventureDetailView(BaseView):
             else:
                 st.warning("冒険データが見つかりません。")
 
+    @st.cache_resource(max_entries=10)
+    def load_indexed_area_csv(_self, area_name: str):
+        return _self._index_by_adventure(_self.file_handler.load_area_csv(area_name))
+
+    @st.cache_resource(max_entries=10)
+    def load_indexed_check_csv(_self, area_name: str, check_type: str):
+        return _self._index_by_adventure(_self.file_handler.load_check_csv(area_name, check_type))
+
+    @staticmethod
+    def _index_by_adventure(df):
+        # 読み込み時に一度だけ冒険名を索引にしておく（列としても残す）
+        if df is None or "冒険名" not in df.columns:
+            return df
+        return df.set_index(df["冒険名"].rename(None), drop=False)
+
     def _render_row(self, df, adventure_name: str, info_title: str, area_name: str = None) -> bool:
         if df is not None:
-            adventure_row = df[df["冒険名"] == adventure_name]
-            if not adventure_row.empty:
+            # 冒険名の索引から1行をハッシュで引く（全行の比較をしない）
+            if adventure_name in df.index:
+                adventure_row = df.loc[[adventure_name]]
                 st.markdown(f"**{info_title}**")
                 if area_name:
                     clickable_adv_row = self._make_adventures_clickable(adventure_row, area_name)
@@ -72,6 +90,9 @@ class AdventureDetailView(BaseView):
         location_path = self.file_handler.get_location_path(area_name, adventure_name)
 
         content = self.read_text(adventure_path)
+        if content and len(content) > LARGE_CONTENT_CHARS:
+            if not st.toggle(f"冒険テキストを表示 ({len(content) // 1024:,} KB)", key=f"show_large_content_{area_name}_{adventure_name}"):
+                return
         location = self.read_text(location_path)
 
         if content and location:
@@ -85,16 +106,19 @@ class AdventureDetailView(BaseView):
             st.warning(f"{adventure_name}の冒険テキストが存在しません。")
 
     def _create_numbered_content(self, content: str, location: str = None) -> str:
+        # 行数の分だけ呼ぶので、属性の参照はループの外で済ませておく
+        make_clickable = self.file_handler._make_terms_clickable
+        terms_dict = self.terms_dict
         if location is None:
-            return "\n".join(
-                f"{i+1}. {self.file_handler._make_terms_clickable(line, self.terms_dict)}"
-                for i, line in enumerate(content.splitlines())
-            )
+            return "\n".join([
+                f"{i}. {make_clickable(line, terms_dict)}"
+                for i, line in enumerate(content.splitlines(), 1)
+            ])
         else:
-            return "\n".join(
-                f"{i+1}. [{loc}] {self.file_handler._make_terms_clickable(line, self.terms_dict)}"
+            return "\n".join([
+                f"{i}. [{loc}] {make_clickable(line, terms_dict)}"
                 for i, (line, loc) in enumerate(zip(
                     content.splitlines(),
                     location.splitlines()
-                ))
-            )
+                ), 1)
+            ])
@@ -3,6 +3,13 @@ import re
 
 from ..views.base import BaseView
 
+# (チェックの種類, 見出し, 削除の種類, 列をまとめて表示するか)
+_CHECK_SECTIONS = (
+    ("adv", "冒険サマリー", "adventures", True),
+    ("log", "冒険ログ", "logs", False),
+    ("loc", "位置情報", "locations", False),
+)
+
 class AreaDetailView(BaseView):
     def render(self, area_name: str, areas_df):
         st.title(f"{area_name} のデータ")
@@ -16,8 +23,7 @@ class AreaDetailView(BaseView):
 
     def _render_progress(self, df):
         total = len(df)
-        completed = sum(1 for adv in df["冒険名"] 
-                       if self.progress_tracker.is_adventure_complete(self.area_name, adv))
+        completed = int(self._completed_mask(df).sum())
         if total == 0:
             st.warning("冒険データが存在しません。")
             return
@@ -26,6 +32,10 @@ class AreaDetailView(BaseView):
             f"冒険データ存在数: {completed} / {total}"
         )
 
+    def _completed_mask(self, df):
+        completion, _ = self._adventure_state(self.area_name)
+        return df["冒険名"].isin([adv for adv, complete in completion.items() if complete])
+
     def _render_area_info(self, areas_df, area_name):
         area_df = areas_df[areas_df["エリア名"] == area_name]
         if not area_df.empty:
@@ -35,10 +45,12 @@ class AreaDetailView(BaseView):
                 self._display_dataframe_grouped(clickable_area_df, start_idx=1)
 
     def _render_adventures_by_result(self, df, area_name):
+        # 結果ごとに3回比較するのではなく、1回のグループ分けで振り分けて完了数も同時に数える
+        result_dfs = dict(tuple(df.groupby("結果", sort=False)))
+        completed_counts = self._completed_mask(df).groupby(df["結果"], sort=False).sum()
         for result in ["失敗", "成功", "大成功"]:
-            result_df = df[df["結果"] == result]
-            completed = sum(1 for adv in result_df["冒険名"] 
-                          if self.progress_tracker.is_adventure_complete(self.area_name, adv))
+            result_df = result_dfs.get(result, df.iloc[:0])
+            completed = int(completed_counts.get(result, 0))
             
             with st.expander(f"冒険結果: {result} ({completed}/{len(result_df)})"):
                 if not result_df.empty:
@@ -46,40 +58,26 @@ class AreaDetailView(BaseView):
                     self._display_dataframe(clickable_df)
 
     def _render_check_sections(self, area_name: str, total_adventures: int):
-        self._render_check_adventure_section(area_name, total_adventures)
-        self._render_check_log_section(area_name, total_adventures)
-        self._render_check_location_section(area_name, total_adventures)
-
-    def _render_check_adventure_section(self, area_name: str, total: int):
-        check_df = self.load_check_csv(area_name, "adv")
-        if check_df is not None:
-            with st.expander(f"チェック: 冒険サマリー({len(check_df)}/{total})"):
-                clickable_df = self._make_adventures_clickable(check_df, area_name)
-                selected_df = self._display_dataframe_with_checkbox_grouped(check_df, clickable_df)
-                
-                self._handle_deletion(selected_df, area_name, "adventures")
+        check_dfs = self.load_check_dfs(area_name)
+        for check_type, title, delete_type, grouped in _CHECK_SECTIONS:
+            check_df = check_dfs[check_type]
+            if check_df is not None:
+                with st.expander(f"チェック: {title}({len(check_df)}/{total_adventures})"):
+                    self._render_check_table(check_df, area_name, delete_type, grouped)
 
-    def _render_check_log_section(self, area_name: str, total: int):
-        check_df = self.load_check_csv(area_name, "log")
-        if check_df is not None:
-            with st.expander(f"チェック: 冒険ログ({len(check_df)}/{total})"):
-                clickable_df = self._make_adventures_clickable(check_df, area_name)
-                selected_df = self._display_dataframe_with_checkbox_grouped(check_df, clickable_df)
-                self._handle_deletion(selected_df, area_name, "logs")
-
-    def _render_check_location_section(self, area_name: str, total: int):
-        check_df = self.load_check_csv(area_name, "loc")
-        if check_df is not None:
-            with st.expander(f"チェック: 位置情報({len(check_df)}/{total})"):
-                clickable_df = self._make_adventures_clickable(check_df, area_name)
-                selected_df = self._display_dataframe_with_checkbox_grouped(check_df, clickable_df)
-                self._handle_deletion(selected_df, area_name, "locations")
+    # 行の選択で再実行されるのはこの表だけにし、ページ全体や他の表は描画し直さない
+    @st.fragment
+    def _render_check_table(self, check_df, area_name: str, delete_type: str, grouped: bool):
+        clickable_df = self._make_adventures_clickable(check_df, area_name)
+        if grouped:
+            selected_df = self._display_dataframe_with_checkbox_grouped(check_df, clickable_df)
+        else:
+            selected_df = self._display_dataframe_with_checkbox(check_df, clickable_df)
+        self._handle_deletion(selected_df, area_name, delete_type)
 
     def _render_adventures_grouped_by_name(self, area_name: str, adventures_df):
         unique_adventure_names = adventures_df["冒険名"].unique()
-        check_adv_df = self.load_check_csv(area_name, "adv")
-        check_log_df = self.load_check_csv(area_name, "log")
-        check_loc_df = self.load_check_csv(area_name, "loc")
+        check_dfs = self.load_check_dfs(area_name)
 
         for adventure_name in unique_adventure_names:
             label = self._get_adventure_label(area_name, adventure_name)
@@ -98,35 +96,17 @@ class AreaDetailView(BaseView):
                     for c in chapter_cols:
                         adventure_summary_df[c] = adventure_summary_df[c].astype(str).replace({"nan": ""}).fillna("")
                     if last_col and last_col == (chapter_cols[-1] if chapter_cols else None):
-                        suffix = item_name.apply(lambda x: f"｜{x}" if isinstance(x, str) and x.strip() else "")
+                        # item_name は文字列にそろえてあるので、行ごとの lambda ではなく列全体で組み立てる
+                        suffix = ("｜" + item_name).where(item_name.str.strip() != "", "")
                         adventure_summary_df[last_col] = adventure_summary_df[last_col].astype(str).fillna("") + suffix
                     clickable_adv_df = self._make_adventures_clickable(adventure_summary_df, area_name)
                     clickable_adv_df = self.make_groups(clickable_adv_df, "冒険", ["冒険名", "次の冒険", "前の冒険"])
                     self._display_dataframe_grouped(clickable_adv_df, start_idx=1)
 
-                # Check: 冒険サマリー
-                st.markdown("##### チェック: 冒険サマリー")
-                if check_adv_df is not None:
-                    adventure_check_adv_df = check_adv_df[check_adv_df["冒険名"] == adventure_name]
-                    if not adventure_check_adv_df.empty:
-                        clickable_adv_df = self._make_adventures_clickable(adventure_check_adv_df, area_name)
-                        selected_adv_df = self._display_dataframe_with_checkbox_grouped(adventure_check_adv_df, clickable_adv_df)
-                        self._handle_deletion(selected_adv_df, area_name, "adventures")
-
-                # Check: 冒険ログ
-                st.markdown("##### チェック: 冒険ログ")
-                if check_log_df is not None:
-                    adventure_check_log_df = check_log_df[check_log_df["冒険名"] == adventure_name]
-                    if not adventure_check_log_df.empty:
-                        clickable_log_df = self._make_adventures_clickable(adventure_check_log_df, area_name)
-                        selected_log_df = self._display_dataframe_with_checkbox(adventure_check_log_df, clickable_log_df)
-                        self._handle_deletion(selected_log_df, area_name, "logs")
-
-                # Check: 位置情報
-                st.markdown("##### チェック: 位置情報")
-                if check_loc_df is not None:
-                    adventure_check_loc_df = check_loc_df[check_loc_df["冒険名"] == adventure_name]
-                    if not adventure_check_loc_df.empty:
-                        clickable_loc_df = self._make_adventures_clickable(adventure_check_loc_df, area_name)
-                        selected_loc_df = self._display_dataframe_with_checkbox(adventure_check_loc_df, clickable_loc_df)
-                        self._handle_deletion(selected_loc_df, area_name, "locations")
\ No newline at end of file
+                for check_type, title, delete_type, grouped in _CHECK_SECTIONS:
+                    st.markdown(f"##### チェック: {title}")
+                    check_df = check_dfs[check_type]
+                    if check_df is not None:
+                        adventure_check_df = check_df[check_df["冒険名"] == adventure_name]
+                        if not adventure_check_df.empty:
+                            self._render_check_table(adventure_check_df, area_name, delete_type, grouped)
@@ -9,7 +9,7 @@ class AreaListView(BaseView):
 
         total_areas = len(areas_df)
         completed_areas = sum(1 for area in areas_df["エリア名"] 
-                            if self.progress_tracker.is_area_complete(area))
+                            if self.progress_tracker.area_state(area)[0])
         if total_areas == 0:
             st.write("エリアデータが存在しません。")
             return
@@ -29,7 +29,8 @@ class AreaListView(BaseView):
                                placeholder="エリア名でフィルタ",
                                label_visibility="collapsed")
         if keyword:
-            return df[df["エリア名"].str.contains(keyword, case=False)]
+            # 入力は正規表現ではなく文字列として探す（記号を含むエリア名でもエラーにならない）
+            return df[df["エリア名"].str.contains(keyword, case=False, na=False, regex=False)]
         return df
 
     def _render_area_table(self, df: pd.DataFrame) -> str:
@@ -41,6 +42,11 @@ class AreaListView(BaseView):
         check_df = self.load_all_areas_check_csv()
         if check_df is not None:
             with st.expander(f"チェック: エリア({len(check_df)}/{total})"):
-                clickable_df = self._make_areas_clickable(check_df)
-                selected_df = self._display_dataframe_with_checkbox_grouped(check_df, clickable_df, start_idx=1)
-                self._handle_deletion_areas(selected_df)
\ No newline at end of file
+                self._render_check_area_table(check_df)
+
+    # 行の選択で再実行されるのはこの表だけにし、エリア一覧全体は描画し直さない
+    @st.fragment
+    def _render_check_area_table(self, check_df):
+        clickable_df = self._make_areas_clickable(check_df)
+        selected_df = self._display_dataframe_with_checkbox_grouped(check_df, clickable_df, start_idx=1)
+        self._handle_deletion_areas(selected_df)
\ No newline at end of file
@@ -1,86 +1,126 @@
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import quote
+
 import streamlit as st
 import pandas as pd
 
+from src.ui.styles import COMPLETE_PROGRESS_KEY
+
+@lru_cache(maxsize=4096)
+def _format_cell_markdown(value: str) -> Optional[str]:
+    """"名称: 特徴;..." 形式のセルを太字付きの Markdown に整形する。該当しなければ None。
+    再実行のたびに同じセルを組み立て直さないよう、結果を使い回す。"""
+    if ';' in value:
+        formatted_text = ""
+        for element in value.split(';'):
+            if ':' in element:
+                key, val = element.split(':', 1)
+                formatted_text += f"**{key}**: {val}  \n"
+            else:
+                formatted_text += f"{element}  \n"
+        return formatted_text
+    if ':' in value:
+        key, val = value.split(':', 1)
+        return f"**{key}**: {val}"
+    return None
+
+
 class BaseView:
     def __init__(self, file_handler, progress_tracker, terms_dict=None):
         self.file_handler = file_handler
         self.progress_tracker = progress_tracker
         self.terms_dict = terms_dict if terms_dict is not None else {}
+        # エリア名 -> リンクのHTML。ビューは再実行ごとに作り直されるので、1回の描画の中で使い回す
+        self._area_link_cache = {}
+        # エリア名 -> (冒険名ごとの完了状態, すべてのチェックが済んだ冒険名)。同じく1回の描画の中で使い回す
+        self._adventure_state_cache = {}
+        # エリア名 -> {チェックの種類: チェックCSV}。キャッシュからの取り出しを描画につき1回にする
+        self._check_dfs_cache = {}
 
     def _make_areas_clickable(self, df):
-        df_clickable = df.copy()
+        # 列の代入は元の配列を書き換えず差し替えるので、浅いコピーで足りる
+        # (DataFrame.assign は CoW 無効時に全列を深くコピーしてしまう)
+        df_clickable = df.copy(deep=False)
         if "エリア名" in df_clickable.columns:
-            df_clickable["エリア名"] = df_clickable["エリア名"].apply(
-                lambda area: f'<a href="?area={area}" target="_self">'
-                            f'{self._get_area_label(area)}{area}</a>'
-            )
+            df_clickable["エリア名"] = self._area_links(df_clickable["エリア名"])
         if "前のエリア" in df_clickable.columns:
-            df_clickable["前のエリア"] = df_clickable["前のエリア"].apply(
-                lambda area: f'<a href="?area={area}" target="_self">'
-                            f'{self._get_area_label(area)}{area}</a>' if area != "なし" else area
-            )
+            df_clickable["前のエリア"] = self._area_links(df_clickable["前のエリア"], keep_none=True)
         if "次のエリア" in df_clickable.columns:
-            df_clickable["次のエリア"] = df_clickable["次のエリア"].apply(
-                lambda area: f'<a href="?area={area}" target="_self">'
-                            f'{self._get_area_label(area)}{area}</a>' if area != "なし" else area
-            )
+            df_clickable["次のエリア"] = self._area_links(df_clickable["次のエリア"], keep_none=True)
         return df_clickable
 
+    def _area_links(self, areas: pd.Series, keep_none: bool = False) -> pd.Series:
+        # リンクは同じエリアにつき1回だけ組み立て、エリア名・前後のエリアの列や複数の表で使い回す
+        names = areas.astype(str)
+        link_cache = self._area_link_cache
+        for area in names.unique():
+            if area not in link_cache and not (keep_none and area == "なし"):
+                link_cache[area] = f'<a href="?area={quote(area)}" target="_self">{self._get_area_label(area)}{area}</a>'
+        links = names.map(link_cache)
+        if keep_none:
+            links = links.where(names != "なし", areas)
+        return links
+
     def _make_adventures_clickable(self, df, area_name: str):
-        df_clickable = df.copy()
+        # 列は丸ごと差し替えるだけなので、共有している元の表は浅いコピーで守れる
+        df_clickable = df.copy(deep=False)
         if "冒険名" in df_clickable.columns:
-            df_clickable["冒険名"] = df_clickable["冒険名"].apply(
-                lambda adv: f'<a href="?area={area_name}&adv={adv}" target="_self">'
-                        f'{self._get_adventure_label(area_name, adv)}{adv}</a>'
-            )
+            df_clickable["冒険名"] = self._adventure_links(df_clickable["冒険名"], area_name)
         if "前の冒険" in df_clickable.columns:
             prev_adventure = df_clickable["前の冒険"].to_list()[0]
             if prev_adventure != "なし":
                 prev_area_name = prev_adventure.split('_')[1]
-                df_clickable["前の冒険"] = df_clickable["前の冒険"].apply(
-                    lambda adv: f'<a href="?area={prev_area_name}&adv={adv}" target="_self">'
-                            f'{self._get_adventure_label(prev_area_name, adv)}{adv}</a>'
-                )
+                df_clickable["前の冒険"] = self._adventure_links(df_clickable["前の冒険"], prev_area_name)
         if "次の冒険" in df_clickable.columns:
             prev_adventure = df_clickable["次の冒険"].to_list()[0]
             if prev_adventure != "なし":
                 prev_area_name = prev_adventure.split('_')[1]
-                df_clickable["次の冒険"] = df_clickable["次の冒険"].apply(
-                    lambda adv: f'<a href="?area={prev_area_name}&adv={adv}" target="_self">'
-                            f'{self._get_adventure_label(prev_area_name, adv)}{adv}</a>'
-                )
+                df_clickable["次の冒険"] = self._adventure_links(df_clickable["次の冒険"], prev_area_name)
         return df_clickable
 
+    def _adventure_links(self, adventures: pd.Series, area_name: str) -> pd.Series:
+        # ラベルは同じ冒険につき1回だけ求め、リンクは列全体の文字列連結で組み立てる
+        names = adventures.astype(str)
+        unique_names = names.unique()
+        labels = names.map({adv: self._get_adventure_label(area_name, adv) for adv in unique_names})
+        # クエリの値は & や # を含んでも壊れないようエスケープする（同じ冒険名は1回だけ）
+        quoted = names.map({adv: quote(adv) for adv in unique_names})
+        return f'<a href="?area={quote(area_name)}&adv=' + quoted + '" target="_self">' + labels + names + '</a>'
+
     def _get_area_label(self, area: str) -> str:
-        if self.progress_tracker.is_area_complete(area):
-            if self.progress_tracker.is_area_all_checked(area):
+        complete, all_checked = self.progress_tracker.area_state(area)
+        if complete:
+            if all_checked:
                 return "✅"
             return "🚧"
         return ""
 
     def _get_adventure_label(self, area_name: str, adventure_name: str) -> str:
-        if self.progress_tracker.is_adventure_complete(area_name, adventure_name):
-            if self.progress_tracker.is_adventure_all_checked(area_name, adventure_name):
+        completion, all_checked = self._adventure_state(area_name)
+        if completion.get(adventure_name, False):
+            if adventure_name in all_checked:
                 return "✅"
             return "🚧"
         return ""
+
+    def _adventure_state(self, area_name: str):
+        # 冒険ごとにファイルやチェックCSVを見に行かず、エリア単位でまとめて1回だけ調べる
+        state = self._adventure_state_cache.get(area_name)
+        if state is None:
+            completion = self.progress_tracker.adventure_completion(area_name)
+            all_checked = None
+            for check_df in self.load_check_dfs(area_name).values():
+                checked = set(check_df["冒険名"]) if check_df is not None else set()
+                all_checked = checked if all_checked is None else all_checked & checked
+            state = self._adventure_state_cache[area_name] = (completion, all_checked)
+        return state
     
     def render_format_cell_content(self, value):
         if isinstance(value, str):
-
-
-            if ';' in value:
-                formatted_text = ""
-                for element in value.split(';'):
-                    if ':' in element:
-                        key, val = element.split(':', 1)
-                        formatted_text += f"**{key}**: {val}  \n"
-                    else:
-                        formatted_text += f"{element}  \n"
+            formatted_text = _format_cell_markdown(value)
+            if formatted_text is not None:
                 return st.markdown(formatted_text)
-            elif ':' in value:
-                key, val = value.split(':', 1)
-                return st.markdown(f"**{key}**: {val}")
         return st.html(value)
 
     def display_dataframe(self, df: pd.DataFrame,
@@ -130,11 +170,14 @@ class BaseView:
                     st.write(f"**{header}**")
                 col_idx += 1
 
-        for idx, row in df_clickable.iterrows():
+        # iterrows は1行ごとに Series を作るので、素のタプルで行をたどる
+        columns = list(df_clickable.columns)
+        for idx, row in zip(df_clickable.index, df_clickable.itertuples(index=False, name=None)):
             row_columns_config = [0.5] if display_checkbox else []
             if group_columns:
+                # 列のまとめは1行につき1回だけ行い、列幅の設定と描画の両方で使う
                 grouped_row = {}
-                for key, value in row.items():
+                for key, value in zip(columns, row):
                     if isinstance(key, str) and " - " in key:
                         parent, child = key.split(" - ", 1)
                         grouped_row.setdefault(parent, {})[child] = value
@@ -148,21 +191,13 @@ class BaseView:
 
             if display_checkbox:
                 checkbox_key_suffix = st.session_state.get('delete_counter', 0)
-                checkbox_key = f"checkbox_{row.values[1]}_{idx}_{checkbox_key_suffix}"
+                checkbox_key = f"checkbox_{row[1]}_{idx}_{checkbox_key_suffix}"
                 with row_cols[row_col_idx]:
                     if st.checkbox("選択", key=checkbox_key, label_visibility="collapsed"):
                         selected_indices.append(idx)
                 row_col_idx += 1
 
             if group_columns:
-                grouped_row = {}
-                for key, value in row.items():
-                    if isinstance(key, str) and " - " in key:
-                        parent, child = key.split(" - ", 1)
-                        grouped_row.setdefault(parent, {})[child] = value
-                    else:
-                        grouped_row[key] = value
-
                 for group_name, group_content in grouped_row.items():
                     with row_cols[row_col_idx]:
                         if isinstance(group_content, dict):
@@ -176,9 +211,9 @@ class BaseView:
                 for i in range(len(row)):
                     with row_cols[row_col_idx]:
                         if i < start_content_col_idx:
-                            st.html(row.iloc[i])
+                            st.html(row[i])
                         else:
-                            self.render_format_cell_content(row.iloc[i])
+                            self.render_format_cell_content(row[i])
                         row_col_idx += 1
 
         return df.loc[selected_indices] if display_checkbox and selected_indices else pd.DataFrame()
@@ -206,55 +241,74 @@ class BaseView:
         return df
 
     def _handle_deletion(self, selected_df, area_name: str, delete_type: str):
+        delete_key = f"delete_{delete_type}_{area_name}"
+        self._show_delete_messages(delete_key)
         if selected_df.empty:
             st.write("ℹ️ 削除するには行を選択してください。")
         else:
             st.dataframe(selected_df["冒険名"], hide_index=True)
-            if st.button("🔥 選択行を削除", key=f"delete_{delete_type}_{area_name}"):
+            if st.button("🔥 選択行を削除", key=delete_key):
                 adventures_to_delete = selected_df["冒険名"].tolist()
                 delete_messages = self.file_handler.delete_content(area_name, adventures_to_delete, delete_type)
-                for message in delete_messages:
-                    st.write(message)
-                st.session_state.delete_counter = st.session_state.get("delete_counter", 0) + 1
-                st.cache_data.clear()
+                self._rerun_after_deletion(delete_key, delete_messages)
 
     def _handle_deletion_areas(self, selected_df):
+        delete_key = "delete_areas"
+        self._show_delete_messages(delete_key)
         if selected_df.empty:
             st.write("ℹ️ 削除するには行を選択してください。")
         else:
             st.dataframe(selected_df["エリア名"], hide_index=True)
-            if st.button("🔥 選択行を削除", key="delete_areas"):
+            if st.button("🔥 選択行を削除", key=delete_key):
                 areas_to_delete = selected_df["エリア名"].tolist()
                 delete_messages = self.file_handler.delete_content("", areas_to_delete, "areas")
-                for message in delete_messages:
-                    st.write(message)
-                st.session_state.delete_counter = st.session_state.get("delete_counter", 0) + 1
-                st.cache_data.clear()
+                self._rerun_after_deletion(delete_key, delete_messages)
+
+    def _show_delete_messages(self, delete_key: str):
+        for message in st.session_state.pop(f"{delete_key}_messages", []):
+            st.write(message)
+
+    def _rerun_after_deletion(self, delete_key: str, delete_messages):
+        # フラグメントの再実行では呼び出し時の DataFrame がそのまま使われるので、
+        # 削除後はアプリ全体を再実行して表・進捗・件数をすべて読み直す。結果のメッセージは再実行後に表示する
+        st.session_state[f"{delete_key}_messages"] = list(delete_messages)
+        st.session_state.delete_counter = st.session_state.get("delete_counter", 0) + 1
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        st.rerun(scope="app")
 
     def render_progress_bar(self, ratio: float, label: str):
+        # 完了時の色はページ初期化時に入れたスタイルで付くので、ここでは key 付きのコンテナで囲むだけにする
+        # (コンテナには st-key-<key> のクラスが付く)
         if ratio == 1.0:
-            st.markdown(
-                """
-                <style>
-                .stProgress > div > div > div > div {
-                    background-color: #03C03C;
-                }
-                </style>
-                """,
-                unsafe_allow_html=True
-            )
-        st.write(label)
-        st.progress(ratio)
+            self._complete_progress_count = getattr(self, "_complete_progress_count", 0) + 1
+            container = st.container(key=f"{COMPLETE_PROGRESS_KEY}_{self._complete_progress_count}")
+        else:
+            container = st.container()
+        with container:
+            st.write(label)
+            st.progress(ratio)
 
-    @st.cache_data(max_entries=10)
+    # 表は読み取り専用で扱うので、取り出しのたびに pickle から複製される cache_data ではなく
+    # cache_resource で同じ DataFrame を共有する。書き換える側は自分でコピーすること
+    @st.cache_resource(max_entries=10)
     def load_area_csv(_self, area_name: str):
         return _self.file_handler.load_area_csv(area_name)
         
-    @st.cache_data(max_entries=10)
+    @st.cache_resource(max_entries=10)
     def load_check_csv(_self, area_name: str, check_type: str):
         return _self.file_handler.load_check_csv(area_name, check_type)
 
-    @st.cache_data(max_entries=10)
+    def load_check_dfs(self, area_name: str):
+        """冒険サマリー・冒険ログ・位置情報のチェックCSVをまとめて返す。描画中は同じ DataFrame を共有するので書き換えないこと。"""
+        check_dfs = self._check_dfs_cache.get(area_name)
+        if check_dfs is None:
+            check_dfs = self._check_dfs_cache[area_name] = {
+                check_type: self.load_check_csv(area_name, check_type) for check_type in ("adv", "log", "loc")
+            }
+        return check_dfs
+
+    @st.cache_resource(max_entries=10)
     def load_all_areas_check_csv(_self):
         return _self.file_handler.load_all_areas_check_csv()
 
@@ -0,0 +1,29 @@
+import os
+import tempfile
+from pathlib import Path
+
+# mkstemp は 0600 で作るので、新規ファイルには open() と同じく umask を適用した権限を付け直す
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """一時ファイルに一度で書き込んで fsync し、置き換える。途中で落ちても元のファイルは残る。
+
+    一時ファイルは書き込みごとに別名で作るので、同じファイルを同時に書き換えても互いの一時ファイルを壊さない。
+    """
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            try:
+                mode = os.stat(path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o666 & ~_UMASK
+            os.fchmod(f.fileno(), mode)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
@@ -1,8 +1,12 @@
-import sys
-import time
+import io
 import random
+import asyncio
+from itertools import islice
+from functools import wraps, cached_property, lru_cache
+from types import MappingProxyType, SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Set
 from pathlib import Path
 
 from src.checkers import AreaChecker, AdventureChecker, LogChecker, LocationChecker
@@ -11,6 +15,16 @@ from src.utils import FileHandler
 from src.utils.csv_handler import CSVHandler
 from src.utils.retry import retry_on_failure, RateLimitExeeded, RetryLimitExeeded
 from src.utils.progress import ProgressTracker
+from src.utils.rate_limiter import RateLimiter
+
+# 章ログの先行生成が外れる割合がこれを超えたら逐次生成に戻す
+SPECULATION_MISS_RATE = 0.5
+
+_ADVENTURE_TYPES = (
+    MappingProxyType({"result": "失敗", "nums": tuple(range(1, 11))}),
+    MappingProxyType({"result": "成功", "nums": tuple(range(1, 10))}),
+    MappingProxyType({"result": "大成功", "nums": (1,)}),
+)
 
 
 @dataclass
@@ -19,6 +33,7 @@ class CommandContext:
     client_type: str
     model_name: Optional[str]
     debug_mode: bool
+    rate_limiter: Optional[RateLimiter] = None
 
 @dataclass
 class Adventure:
@@ -29,14 +44,52 @@ class Adventure:
     prev_adventure_name: Optional[str] = "なし"
 
 
+def _penalize_rate_limiter(handler: "CommandHandler", *args: Any, **kwargs: Any) -> None:
+    # レート制限を受けたら、リトライを待つ前に補充速度を落とし、以降のリクエストの間隔を空ける
+    handler.rate_limiter.penalize()
+
+
+def rate_limit_guard(func: Callable) -> Callable:
+    """RateLimitExeeded を捕捉し、ログを残したうえで再送出する。"""
+    @wraps(func)
+    def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return func(self, *args, **kwargs)
+        except RateLimitExeeded:
+            self.logger.warning(f"API制限: リトライ上限に達しました。モデル：{self.context.model_name}")
+            raise
+    return wrapper
+
+
 class CommandHandler:
     def __init__(self, context: CommandContext, config_manager, logger):
         self.context = context
         self.config = config_manager
         self.logger = logger
         self.file_handler = FileHandler(self.config.paths)
-        self.csv_handler = CSVHandler()
+        self.csv_handler = CSVHandler(trusted_fast_path=self.config.csv_trusted_fast_path)
         self.progress_tracker = ProgressTracker(self.file_handler)
+        self.rate_limiter = context.rate_limiter or RateLimiter.from_config(self.config)
+        self._rng = random.Random(self.config.random_seed)
+        self._area_adventures: Dict[str, Dict[str, Adventure]] = {}
+        prompt_dir = self.config.paths.prompt_dir
+        self._prompts = SimpleNamespace(
+            new_area=prompt_dir / "new_area.txt",
+            check_area=prompt_dir / "check_area.txt",
+            new_locked_area=prompt_dir / "new_locked_area.txt",
+            new_adventure=prompt_dir / "new_adventure.txt",
+            check_adventure=prompt_dir / "check_adventure.txt",
+            new_locked_adventure=prompt_dir / "new_locked_adventure.txt",
+            extract_log=prompt_dir / "extract_log.txt",
+            new_log=prompt_dir / "new_log.txt",
+            check_log=prompt_dir / "check_log.txt",
+            new_locked_log=prompt_dir / "new_locked_log.txt",
+            new_location=prompt_dir / "new_location.txt",
+            check_location=prompt_dir / "check_location.txt",
+        )
+
+    def _throttle(self) -> None:
+        self.rate_limiter.acquire(self.config.estimated_tokens_per_request)
 
     def execute_area_command(self, difficulty: int = 1) -> None:
         return self._execute_area_impl(difficulty, check_only=False)
@@ -47,28 +100,26 @@ class CommandHandler:
     def _execute_area_impl(self, difficulty: int, check_only: bool) -> None:
         area_generator = AreaGenerator(
             self.context.client,
-            self.config.paths.prompt_dir / "new_area.txt",
+            self._prompts.new_area,
             self.file_handler.get_lv_areas_csv_path(difficulty),
             self.config
         )
         area_checker = AreaChecker(
             self.context.client,
-            self.config.paths.prompt_dir / "check_area.txt",
+            self._prompts.check_area,
             self.config.area_check_keys,
             self.config.check_marks
         )
-        for area_name in self.file_handler.load_noprev_area_names():
-            if self.progress_tracker.is_area_complete(area_name) and self.progress_tracker.is_area_all_checked(area_name):
-                pass
-            else:
-                self.logger.warning(f"未完了: {area_name}")
-                if not self.context.debug_mode:
-                    self.logger.warning("エリア: 未完了エリアがあるため終了します")
-                    return
+        for area_name in self.progress_tracker.pending_areas(self.file_handler.load_noprev_area_names()):
+            self.logger.warning(f"未完了: {area_name}")
+            if not self.context.debug_mode:
+                self.logger.warning("エリア: 未完了エリアがあるため終了します")
+                return
         
         if check_only:
             for area_name in self.file_handler.load_all_area_names():
                 area_data = self._load_area_data(area_name)
+                self._throttle()
                 check_result = area_checker.check_area(
                     area_data=type("_", (), {"name": area_data["エリア名"], "description": area_data.get("説明", "")})(),
                     existing_df=self.file_handler.load_areas_csv(),
@@ -87,19 +138,16 @@ class CommandHandler:
     def _execute_locked_area_impl(self, difficulty: int, check_only: bool) -> None:
         area_checker = AreaChecker(
             self.context.client,
-            self.config.paths.prompt_dir / "check_area.txt",
+            self._prompts.check_area,
             self.config.area_check_keys,
             self.config.check_marks
         )
         
-        for area_name in self.file_handler.load_all_area_names():
-            if self.progress_tracker.is_area_complete(area_name) and self.progress_tracker.is_area_all_checked(area_name):
-                pass
-            else:
-                self.logger.warning(f"未完了: {area_name}")
-                if not self.context.debug_mode:
-                    self.logger.warning("未開放エリア: 未完了エリアがあるため終了します")
-                    return
+        for area_name in self.progress_tracker.pending_areas(self.file_handler.load_all_area_names()):
+            self.logger.warning(f"未完了: {area_name}")
+            if not self.context.debug_mode:
+                self.logger.warning("未開放エリア: 未完了エリアがあるため終了します")
+                return
 
         # まだ次のエリアが生成されていないエリアを抽出
         nonext_area_name, lv = self.file_handler.load_nonext_area_name_and_lv()
@@ -109,13 +157,13 @@ class CommandHandler:
 
         area_generator = AreaGenerator(
             self.context.client,
-            self.config.paths.prompt_dir / "new_locked_area.txt",
+            self._prompts.new_locked_area,
             self.file_handler.get_lv_areas_csv_path(difficulty),
             self.config
         ) if not check_only else None
         area_checker = AreaChecker(
             self.context.client,
-            self.config.paths.prompt_dir / "check_area.txt",
+            self._prompts.check_area,
             self.config.area_check_keys,
             self.config.check_marks
         )
@@ -133,108 +181,110 @@ class CommandHandler:
     def check_locked_adventure_only(self, result_filter: Optional[str] = None) -> None:
         return self._execute_locked_adventure_impl(result_filter, check_only=True)
 
+    @rate_limit_guard
     def _execute_adventure_impl(self, result_filter: Optional[str], check_only: bool) -> None:
         adventure_generator = AdventureGenerator(
             self.context.client,
-            self.config.paths.prompt_dir / "new_adventure.txt",
+            self._prompts.new_adventure,
             [self.file_handler.get_lv_areas_csv_path(1)],
             self.config
         )
         adventure_checker = AdventureChecker(
             self.context.client,
-            self.config.paths.prompt_dir / "check_adventure.txt",
+            self._prompts.check_adventure,
             self.config.adventure_check_keys,
             self.config.check_marks
         )
         if self.context.debug_mode:
             print("[DEBUG] execute_adventure_command start")
-        for area_name in self.file_handler.load_noprev_area_names():
-            try:
-                if self.context.debug_mode:
-                    print(f"[DEBUG] area_name={area_name} result_filter={result_filter}")
-                if check_only:
-                    area_data = self._load_area_data(area_name)
-                    existing_adventures = self._get_existing_adventures(area_name)
-                    for adv_name in existing_adventures:
-                        adv = self._get_area_adventure(area_name, adv_name)
-                        check_result = adventure_checker.check_adventure(
-                            area=','.join([area_data["エリア名"]] + list(area_data.values())[4:]),
-                            result=adv.result,
-                            result_desc=adventure_generator.config.result_template[adv.result] if adventure_generator else "",
-                            summary=','.join(adv.chapters),
-                            items_str=';',
-                            adventure_name=adv.name,
-                            debug=self.context.debug_mode
-                        )
-                        adventure_checker.save(check_result, self.file_handler.get_check_path(area_name, "adv"))
-                else:
-                    debug_breaked = self._process_area_adventures(
-                        adventure_generator,
-                        adventure_checker,
-                        area_name,
-                        result_filter
+        area_names = self.file_handler.load_noprev_area_names()
+        if self._can_run_areas_concurrently(check_only):
+            self._run_areas_concurrently(
+                lambda area_name: self._process_area_adventures(adventure_generator, adventure_checker, area_name, result_filter),
+                area_names
+            )
+            return
+        for area_name in area_names:
+            if self.context.debug_mode:
+                print(f"[DEBUG] area_name={area_name} result_filter={result_filter}")
+            if check_only:
+                area_joined = self._join_area_data(self._load_area_data(area_name))
+                existing_adventures = self._get_existing_adventures(area_name)
+                for adv_name in existing_adventures:
+                    adv = self._get_area_adventure(area_name, adv_name)
+                    self._throttle()
+                    check_result = adventure_checker.check_adventure(
+                        area=area_joined,
+                        result=adv.result,
+                        result_desc=adventure_generator.config.result_template[adv.result] if adventure_generator else "",
+                        summary=','.join(adv.chapters),
+                        items_str=';',
+                        adventure_name=adv.name,
+                        debug=self.context.debug_mode
                     )
-            except RateLimitExeeded:
-                self.logger.warning(f"API制限: リトライします。モデル：{self.context.model_name}")
-                raise
+                    adventure_checker.save(check_result, self.file_handler.get_check_path(area_name, "adv"))
+            else:
+                debug_breaked = self._process_area_adventures(
+                    adventure_generator,
+                    adventure_checker,
+                    area_name,
+                    result_filter
+                )
             if not check_only and debug_breaked:
                 break
 
+    @rate_limit_guard
     def _execute_locked_adventure_impl(self, result_filter: Optional[str], check_only: bool) -> None:
         adventure_generator = AdventureGenerator(
             self.context.client,
-            self.config.paths.prompt_dir / "new_locked_adventure.txt",
+            self._prompts.new_locked_adventure,
             self.file_handler.get_all_areas_csv_path(),
             self.config
         ) if not check_only else None
         adventure_checker = AdventureChecker(
             self.context.client,
-            self.config.paths.prompt_dir / "check_adventure.txt",
+            self._prompts.check_adventure,
             self.config.adventure_check_keys,
             self.config.check_marks
         )
         log_extrator = Extractor(
             self.context.client,
-            self.config.paths.prompt_dir / "extract_log.txt",
+            self._prompts.extract_log,
             self.file_handler.get_all_areas_csv_path(),
             self.config
         )
 
-        for noprev_area_name in self.file_handler.load_noprev_area_names():
-            if not self.progress_tracker.is_area_complete(noprev_area_name) or not self.progress_tracker.is_area_all_checked(noprev_area_name):
-                self.logger.warning(f"未完了: {noprev_area_name}")
-                if not self.context.debug_mode:
-                    self.logger.warning("未開放冒険: 未完了エリアがあるため終了します")
-                    return
+        for noprev_area_name in self.progress_tracker.pending_areas(self.file_handler.load_noprev_area_names()):
+            self.logger.warning(f"未完了: {noprev_area_name}")
+            if not self.context.debug_mode:
+                self.logger.warning("未開放冒険: 未完了エリアがあるため終了します")
+                return
 
         for area_name in self.file_handler.load_prevexist_area_names():
-            try:
-                if check_only:
-                    area_data = self._load_area_data(area_name)
-                    existing_adventures = self._get_existing_adventures(area_name)
-                    for adv_name in existing_adventures:
-                        adv = self._get_area_adventure(area_name, adv_name)
-                        check_result = adventure_checker.check_adventure(
-                            area=','.join([area_data["エリア名"]] + list(area_data.values())[4:]),
-                            result=adv.result,
-                            result_desc=adventure_generator.config.result_template[adv.result] if adventure_generator else "",
-                            summary=','.join(adv.chapters),
-                            items_str=';',
-                            adventure_name=adv.name,
-                            debug=self.context.debug_mode
-                        )
-                        adventure_checker.save(check_result, self.file_handler.get_check_path(area_name, "adv"))
-                else:
-                    debug_breaked = self._process_area_adventures(
-                        adventure_generator,
-                        adventure_checker,
-                        area_name,
-                        result_filter,
-                        log_extrator
+            if check_only:
+                area_joined = self._join_area_data(self._load_area_data(area_name))
+                existing_adventures = self._get_existing_adventures(area_name)
+                for adv_name in existing_adventures:
+                    adv = self._get_area_adventure(area_name, adv_name)
+                    self._throttle()
+                    check_result = adventure_checker.check_adventure(
+                        area=area_joined,
+                        result=adv.result,
+                        result_desc=adventure_generator.config.result_template[adv.result] if adventure_generator else "",
+                        summary=','.join(adv.chapters),
+                        items_str=';',
+                        adventure_name=adv.name,
+                        debug=self.context.debug_mode
                     )
-            except RateLimitExeeded:
-                self.logger.warning(f"API制限: リトライします。モデル：{self.context.model_name}")
-                raise
+                    adventure_checker.save(check_result, self.file_handler.get_check_path(area_name, "adv"))
+            else:
+                debug_breaked = self._process_area_adventures(
+                    adventure_generator,
+                    adventure_checker,
+                    area_name,
+                    result_filter,
+                    log_extrator
+                )
             if not check_only and debug_breaked:
                 break
 
@@ -244,34 +294,39 @@ class CommandHandler:
     def check_log_only(self) -> None:
         return self._execute_log_impl(check_only=True)
 
+    @rate_limit_guard
     def _execute_log_impl(self, check_only: bool) -> None:
         log_generator = LogGenerator(
             self.context.client,
-            self.config.paths.prompt_dir / "new_log.txt",
+            self._prompts.new_log,
             [self.file_handler.get_lv_areas_csv_path(1)],
             self.config
         )
         log_checker = LogChecker(
             self.context.client,
-            self.config.paths.prompt_dir / "check_log.txt",
+            self._prompts.check_log,
             self.config.log_check_keys,
             self.config.check_marks
         )
         
-        for area_name in self.file_handler.load_noprev_area_names():
-            try:
-                if check_only:
-                    adventures = self._get_area_adventures(area_name)
-                    for adv in adventures:
-                        if self._is_log_generated(area_name, adv.name):
-                            summary = ','.join(adv.chapters)
-                            check_result = log_checker.check_log(summary, adv.result, self.file_handler.read_adventure_log(area_name, adv.name), adv.name, debug=self.context.debug_mode)
-                            log_checker.save(check_result, self.file_handler.get_check_path(area_name, "log"))
-                else:
-                    debug_breaked = self._process_area_logs(log_generator, log_checker, area_name)
-            except RateLimitExeeded:
-                self.logger.warning(f"API制限: リトライします。モデル：{self.context.model_name}")
-                raise
+        area_names = self.file_handler.load_noprev_area_names()
+        if self._can_run_areas_concurrently(check_only):
+            self._run_areas_concurrently(
+                lambda area_name: self._process_area_logs(log_generator, log_checker, area_name),
+                area_names
+            )
+            return
+        for area_name in area_names:
+            if check_only:
+                adventures = self._get_area_adventures(area_name)
+                for adv in adventures:
+                    if self._is_log_generated(area_name, adv.name):
+                        summary = ','.join(adv.chapters)
+                        self._throttle()
+                        check_result = log_checker.check_log(summary, adv.result, self.file_handler.read_adventure_log(area_name, adv.name), adv.name, debug=self.context.debug_mode)
+                        log_checker.save(check_result, self.file_handler.get_check_path(area_name, "log"))
+            else:
+                debug_breaked = self._process_area_logs(log_generator, log_checker, area_name)
             if not check_only and debug_breaked:
                 break
     def execute_locked_log_command(self) -> None:
@@ -280,34 +335,32 @@ class CommandHandler:
     def check_locked_log_only(self) -> None:
         return self._execute_locked_log_impl(check_only=True)
 
+    @rate_limit_guard
     def _execute_locked_log_impl(self, check_only: bool) -> None:
         log_generator = LogGenerator(
             self.context.client,
-            self.config.paths.prompt_dir / "new_locked_log.txt",
+            self._prompts.new_locked_log,
             [self.file_handler.get_lv_areas_csv_path(1)],
             self.config
         ) if not check_only else None
         log_checker = LogChecker(
             self.context.client,
-            self.config.paths.prompt_dir / "check_log.txt",
+            self._prompts.check_log,
             self.config.log_check_keys,
             self.config.check_marks
         )
         
         for area_name in self.file_handler.load_prevexist_area_names():
-            try:
-                if check_only:
-                    adventures = self._get_area_adventures(area_name)
-                    for adv in adventures:
-                        if self._is_log_generated(area_name, adv.name):
-                            summary = ','.join(adv.chapters)
-                            check_result = log_checker.check_log(summary, adv.result, self.file_handler.read_adventure_log(area_name, adv.name), adv.name, debug=self.context.debug_mode)
-                            log_checker.save(check_result, self.file_handler.get_check_path(area_name, "log"))
-                else:
-                    debug_breaked = self._process_area_logs(log_generator, log_checker, area_name)
-            except RateLimitExeeded:
-                self.logger.warning(f"API制限: リトライします。モデル：{self.context.model_name}")
-                raise
+            if check_only:
+                adventures = self._get_area_adventures(area_name)
+                for adv in adventures:
+                    if self._is_log_generated(area_name, adv.name):
+                        summary = ','.join(adv.chapters)
+                        self._throttle()
+                        check_result = log_checker.check_log(summary, adv.result, self.file_handler.read_adventure_log(area_name, adv.name), adv.name, debug=self.context.debug_mode)
+                        log_checker.save(check_result, self.file_handler.get_check_path(area_name, "log"))
+            else:
+                debug_breaked = self._process_area_logs(log_generator, log_checker, area_name)
             if not check_only and debug_breaked:
                 break
 
@@ -317,39 +370,60 @@ class CommandHandler:
     def check_location_only(self) -> None:
         return self._execute_location_impl(check_only=True)
 
+    @rate_limit_guard
     def _execute_location_impl(self, check_only: bool) -> None:
         location_generator = LocationGenerator(
             self.context.client,
-            self.config.paths.prompt_dir / "new_location.txt",
+            self._prompts.new_location,
             self.file_handler.get_all_areas_csv_path()
         )
         location_checker = LocationChecker(
             self.context.client,
-            self.config.paths.prompt_dir / "check_location.txt",
+            self._prompts.check_location,
             self.config.location_check_keys,
             self.config.check_marks
         )
         
-        for area_name in self.file_handler.load_all_area_names():
-            try:
-                if check_only:
-                    adventures = self._get_area_adventures(area_name)
-                    for adv in adventures:
-                        if self._is_location_generated(area_name, adv.name) and self._is_log_generated(area_name, adv.name):
-                            log_content = self.file_handler.read_adventure_log(area_name, adv.name)
-                            location_content = self.file_handler.read_text(self.file_handler.get_location_path(area_name, adv.name))
-                            log_with_location = "\n".join(f"[{loc}]: {text}" for text, loc in zip(log_content.splitlines(), location_content.splitlines()))
-                            location_candidates = location_generator.get_location_candidates(area_name)
-                            check_result = location_checker.check_location(log_with_location, location_candidates, adv.name, debug=self.context.debug_mode)
-                            location_checker.save(check_result, self.file_handler.get_check_path(area_name, "loc"))
-                else:
-                    debug_breaked = self._process_area_locations(location_generator, location_checker, area_name)
-            except RateLimitExeeded:
-                self.logger.warning(f"API制限: リトライします。モデル：{self.context.model_name}")
-                raise
+        area_names = self.file_handler.load_all_area_names()
+        if self._can_run_areas_concurrently(check_only):
+            self._run_areas_concurrently(
+                lambda area_name: self._process_area_locations(location_generator, location_checker, area_name),
+                area_names
+            )
+            return
+        for area_name in area_names:
+            if check_only:
+                adventures = self._get_area_adventures(area_name)
+                for adv in adventures:
+                    if self._is_location_generated(area_name, adv.name) and self._is_log_generated(area_name, adv.name):
+                        log_content = self.file_handler.read_adventure_log(area_name, adv.name)
+                        location_content = self.file_handler.read_text(self.file_handler.get_location_path(area_name, adv.name))
+                        log_with_location = self._join_log_with_location(log_content, location_content)
+                        location_candidates = location_generator.get_location_candidates(area_name)
+                        self._throttle()
+                        check_result = location_checker.check_location(log_with_location, location_candidates, adv.name, debug=self.context.debug_mode)
+                        location_checker.save(check_result, self.file_handler.get_check_path(area_name, "loc"))
+            else:
+                debug_breaked = self._process_area_locations(location_generator, location_checker, area_name)
             if not check_only and debug_breaked:
                 break
 
+    def _can_run_areas_concurrently(self, check_only: bool) -> bool:
+        # デバッグモードは1件生成で止めるため、逐次処理のままにする
+        return not check_only and not self.context.debug_mode and self.config.max_concurrency > 1
+
+    def _run_areas_concurrently(self, process_area: Callable[[str], Any], area_names: List[str]) -> None:
+        async def run_all() -> None:
+            semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+            async def run_one(area_name: str) -> None:
+                async with semaphore:
+                    await asyncio.to_thread(process_area, area_name)
+
+            await asyncio.gather(*(run_one(area_name) for area_name in area_names))
+
+        asyncio.run(run_all())
+
     def _process_area_adventures(
         self,
         generator: AdventureGenerator,
@@ -360,29 +434,35 @@ class CommandHandler:
     ) -> bool:
         try:
             area_data = self._load_area_data(area_name)
+            area_joined = self._join_area_data(area_data)
             prev_area_name = area_data.get("前のエリア", "なし")
             if self.context.debug_mode:
                 print(f"[DEBUG] prev_area_name={prev_area_name}")
             existing_adventures = self._get_existing_adventures(area_name)
             if self.context.debug_mode:
                 print(f"[DEBUG] existing_adventures={existing_adventures}")
+            allow_first = (prev_area_name == "なし")
+            prev_nonext_adventures = [] if allow_first else self.file_handler.load_nonext_adventures(prev_area_name)
+            if not allow_first and not prev_nonext_adventures:
+                return
             for adventure_type in self._filter_adventure_types(result_filter):
                 if self.context.debug_mode:
                     print(f"[DEBUG] loop adventure_type={adventure_type}")
                 for num in adventure_type["nums"]:
-                    prev_nonext_adventures = self.file_handler.load_nonext_adventures(prev_area_name)
                     adventure_name = f"{adventure_type['result']}{num}_{area_name}"
-                    allow_first = (prev_area_name == "なし")
                     if self.context.debug_mode:
                         print(f"[DEBUG] try adv={adventure_name} prev_nonext={len(prev_nonext_adventures)} allow_first={allow_first}")
                     if adventure_name not in existing_adventures and (allow_first or len(prev_nonext_adventures) > 0):
-                        prev_adventure_name = random.choice(prev_nonext_adventures) if prev_area_name != "なし" and prev_nonext_adventures else None
+                        prev_adventure_name = self._rng.choice(prev_nonext_adventures) if not allow_first else None
                         if self.context.debug_mode:
                             print(f"[DEBUG] generate {adventure_name} prev_adv={prev_adventure_name}")
                         debug_breaked = self._generate_and_check_adventure(
-                            generator, checker, area_name, area_data, adventure_name, 
+                            generator, checker, area_name, area_joined, adventure_name, 
                             adventure_type["result"], extractor, prev_adventure_name, prev_area_name
                         )
+                        # 使った前の冒険には次の冒険が設定されるので、候補から外す
+                        if prev_adventure_name:
+                            prev_nonext_adventures.remove(prev_adventure_name)
                         if debug_breaked == "debug_breaked":
                             return True
         except RetryLimitExeeded as e:
@@ -396,8 +476,9 @@ class CommandHandler:
     ) -> None:
         try:
             adventures = self._get_area_adventures(area_name)
+            existing_logs = self.file_handler.list_adventure_logs(area_name)
             for adventure in adventures:
-                if not self._is_log_generated(area_name, adventure.name):
+                if adventure.name not in existing_logs:
                     debug_breaked = self._generate_and_check_log(
                         generator, checker, area_name, adventure
                     )
@@ -418,8 +499,10 @@ class CommandHandler:
     ) -> None:
         try:
             adventures = self._get_area_adventures(area_name)
+            existing_logs = self.file_handler.list_adventure_logs(area_name)
+            existing_locations = self.file_handler.list_location_files(area_name)
             for adventure in adventures:
-                if not self._is_location_generated(area_name, adventure.name) and self._is_log_generated(area_name, adventure.name):
+                if adventure.name not in existing_locations and adventure.name in existing_logs:
                     debug_breaked = self._generate_and_check_location(
                         generator, checker, area_name, adventure
                     )
@@ -432,24 +515,37 @@ class CommandHandler:
                 self.logger.simple(message)
             raise e
 
+    @cached_property
+    def _area_index(self) -> Dict[str, Dict]:
+        area_index = {}
+        for area_csv in self.file_handler.get_all_areas_csv_path():
+            for row in self.csv_handler.read_rows_fast(area_csv):
+                area_index.setdefault(row["エリア名"], row)
+        return area_index
+
     def _load_area_data(self, area_name: str) -> Dict:
-        area_csvs = self.file_handler.get_all_areas_csv_path()
-        for area_csv in area_csvs:
-            for row in self.csv_handler.read_rows(area_csv):
-                if row["エリア名"] == area_name:
-                    return row
+        return self._area_index.get(area_name)
 
-    def _get_existing_adventures(self, area_name: str) -> List[str]:
+    @staticmethod
+    def _join_area_data(area_data: Dict) -> str:
+        # チェック用にエリア名と5列目以降のエリア情報をつなげる
+        return ','.join([area_data["エリア名"], *islice(area_data.values(), 4, None)])
+
+    @staticmethod
+    def _join_log_with_location(log_content: str, location: str) -> str:
+        # 行リストを作らず、2つのテキストを1行ずつ読み進めて対応付ける
+        log_lines = (line.rstrip("\n") for line in io.StringIO(log_content))
+        location_lines = (line.rstrip("\n") for line in io.StringIO(location))
+        return "\n".join(f"[{loc}]: {text}" for text, loc in zip(log_lines, location_lines))
+
+    def _get_existing_adventures(self, area_name: str) -> Set[str]:
         area_csv = self.file_handler.get_area_csv_path(area_name)
-        return [row["冒険名"] for row in self.csv_handler.read_rows(area_csv) if row.get("冒険名", False)]
+        return {row["冒険名"] for row in self.csv_handler.read_rows_fast(area_csv, usecols=["冒険名"]) if row.get("冒険名")}
 
-    def _filter_adventure_types(self, result_filter: Optional[str]) -> List[Dict]:
-        adventure_types = [
-            {"result": "失敗", "nums": range(1, 11)},
-            {"result": "成功", "nums": range(1, 10)},
-            {"result": "大成功", "nums": [1]}
-        ]
-        return [at for at in adventure_types if not result_filter or at["result"] == result_filter]
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _filter_adventure_types(result_filter: Optional[str]) -> tuple:
+        return tuple(at for at in _ADVENTURE_TYPES if not result_filter or at["result"] == result_filter)
 
     def _get_area_adventures(self, area_name: str) -> List[Adventure]:
         area_csv = self.file_handler.get_area_csv_path(area_name)
@@ -465,30 +561,18 @@ class CommandHandler:
                     chapters=chapters,
                     item=item
                 ))
-        except Exception as e:
-            import traceback
-            print(traceback.format_exc())
-            print(area_csv)
-            raise e
+        except Exception:
+            self.logger.exception(f"冒険の読み込みに失敗しました: {area_csv}")
+            raise
         return adventures
 
     def _get_area_adventure(self, area_name: str, adventure_name: str) -> Adventure:
-        area_csv = self.file_handler.get_area_csv_path(area_name)
-
-        try:
-            for adv_name, prev_adv, next_adv, result, chapters, item in self.csv_handler.read_adventures(area_csv):
-                return Adventure(
-                    name=adv_name,
-                    result=result,
-                    chapters=chapters,
-                    item=item
-                )
-        except Exception as e:
-            import traceback
-            print(traceback.format_exc())
-            print(area_csv)
-            raise e
-        raise ValueError(f"Adventure '{adventure_name}' not found in area '{area_name}'.")
+        if area_name not in self._area_adventures:
+            self._area_adventures[area_name] = {adv.name: adv for adv in self._get_area_adventures(area_name)}
+        adventure = self._area_adventures[area_name].get(adventure_name)
+        if adventure is None:
+            raise ValueError(f"Adventure '{adventure_name}' not found in area '{area_name}'.")
+        return adventure
 
     def _is_log_generated(self, area_name: str, adventure_name: str) -> bool:
         log_path = self.file_handler.get_adventure_path(area_name, adventure_name)
@@ -498,7 +582,8 @@ class CommandHandler:
         location_path = self.file_handler.get_location_path(area_name, adventure_name)
         return location_path.exists()
 
-    @retry_on_failure()
+    @rate_limit_guard
+    @retry_on_failure(on_rate_limit=_penalize_rate_limiter)
     def _generate_and_check_area(
         self,
         generator: AreaGenerator,
@@ -508,8 +593,10 @@ class CommandHandler:
     ) -> None:
         try:
             if prev_area_name:
+                self._throttle()
                 area_data = generator.generate_new_locked_area(prev_area_name=prev_area_name, difficulty=lv, debug=self.context.debug_mode)
             else:
+                self._throttle()
                 area_data = generator.generate_new_area(difficulty=lv, debug=self.context.debug_mode)
             if self.context.debug_mode:
                 print(area_data)
@@ -519,6 +606,7 @@ class CommandHandler:
                 exclude_area_names = [prev_area_name]
             else:
                 exclude_area_names = []
+            self._throttle()
             check_result = checker.check_area(
                 area_data=area_data,
                 existing_df=self.file_handler.load_areas_csv(),
@@ -530,6 +618,7 @@ class CommandHandler:
             self.logger.success(f"エリア: {area_data.name}")
 
             generator.save(area_data)
+            self.__dict__.pop("_area_index", None)
             checker.save(check_result, self.file_handler.get_lv_check_areas_csv_path(lv))
             if prev_area_name:
                 generator.update(
@@ -539,20 +628,16 @@ class CommandHandler:
                 )
 
             return True
-        except RateLimitExeeded:
-            self.logger.warning(f"API制限: 15分待機します。モデル：{self.context.model_name}")
-            time.sleep(60 * 15)
-            sys.exit(1)
         except Exception as e:
             raise e
 
-    @retry_on_failure()
+    @retry_on_failure(on_rate_limit=_penalize_rate_limiter)
     def _generate_and_check_adventure(
         self,
         generator: AdventureGenerator,
         checker: AdventureChecker,
         area_name: str,
-        area_data: Dict,
+        area_joined: str,
         adventure_name: str,
         result: str,
         extractor: Optional[Extractor] = None,
@@ -563,12 +648,14 @@ class CommandHandler:
             # 冒険 生成
             if prev_adventure_name:
                 prev_adventure_text = self.file_handler.read_adventure_log(prev_area_name, prev_adventure_name)
+                self._throttle()
                 impact_data = extractor.extract_log(
                     new_area_name=area_name,
                     pre_area_name=prev_area_name,
                     adventure_log=prev_adventure_text,
                     debug=self.context.debug_mode
                 )
+                self._throttle()
                 adventure = generator.generate_new_locked_adventure(
                     name=adventure_name,
                     result=result,
@@ -578,14 +665,16 @@ class CommandHandler:
                     debug=self.context.debug_mode
                 )
             else:
+                self._throttle()
                 adventure = generator.generate_new_adventure(adventure_name, result, area_name, debug=self.context.debug_mode)
             if self.context.debug_mode:
                 print(adventure)
             self.logger.generate(f"冒険: {adventure_name}")
 
             # 冒険 チェック
+            self._throttle()
             check_result = checker.check_adventure(
-                area=','.join([area_data["エリア名"]] + list(area_data.values())[4:]),
+                area=area_joined,
                 result=adventure.result,
                 result_desc=generator.config.result_template[adventure.result],
                 summary=','.join(adventure.chapters),
@@ -599,10 +688,12 @@ class CommandHandler:
             self.logger.success(f"冒険: {adventure_name}")
             area_csv_path = self.file_handler.get_area_csv_path(area_name)
             generator.save(adventure, area_csv_path)
+            self._area_adventures.pop(area_name, None)
             checker.save(check_result, self.file_handler.get_check_path(area_name, "adv"))
             self.csv_handler.sort_by_result(area_csv_path)
             if prev_adventure_name:
                 generator.update_previous_adventure(self.file_handler.get_area_csv_path(prev_area_name), prev_adventure_name, adventure_name)
+                self._area_adventures.pop(prev_area_name, None)
 
             if self.context.debug_mode:
                 return "debug_breaked"
@@ -610,7 +701,7 @@ class CommandHandler:
         except Exception as e:
             raise e
 
-    @retry_on_failure()
+    @retry_on_failure(on_rate_limit=_penalize_rate_limiter)
     def _generate_and_check_log(
         self,
         generator: LogGenerator,
@@ -628,6 +719,7 @@ class CommandHandler:
 
             # ログ チェック
             summary = ','.join(adventure.chapters)
+            self._throttle()
             check_result = checker.check_log(summary, adventure.result, log_content, adventure.name, item=adventure.item, debug=self.context.debug_mode)
             if self.context.debug_mode:
                 print(check_result)
@@ -645,7 +737,7 @@ class CommandHandler:
                 temp_path.unlink(missing_ok=True)
                 self.logger.delete(f"ログ削除: {temp_path}")
 
-    @retry_on_failure()
+    @retry_on_failure(on_rate_limit=_penalize_rate_limiter)
     def _generate_and_check_location(
         self,
         generator: LocationGenerator,
@@ -657,13 +749,15 @@ class CommandHandler:
             # 位置 生成
             log_content = self.file_handler.read_adventure_log(area_name, adventure.name)
             location_candidates = generator.get_location_candidates(area_name)
+            self._throttle()
             location = generator.generate_location(area_name, log_content, location_candidates, debug=self.context.debug_mode)
             if self.context.debug_mode:
                 print(location)
             self.logger.generate(f"位置: {adventure.name}")
 
             # 位置 チェック
-            log_with_location = "\n".join(f"[{loc}]: {text}" for text, loc in zip(log_content.splitlines(), location.splitlines()))
+            log_with_location = self._join_log_with_location(log_content, location)
+            self._throttle()
             check_result = checker.check_location(log_with_location, location_candidates, adventure.name, debug=self.context.debug_mode)
             if self.context.debug_mode:
                 print(check_result)
@@ -686,7 +780,7 @@ class CommandHandler:
         self.file_handler.write_text(location_path, "\n".join(locations))
         checker.save_check_results(check_result, adventure_name, check_csv_path)
 
-    @retry_on_failure()
+    @retry_on_failure(on_rate_limit=_penalize_rate_limiter)
     def _generate_chapter_logs(
         self,
         generator: LogGenerator,
@@ -696,29 +790,96 @@ class CommandHandler:
     ) -> str:
         previous_log = None
         area_csv_path = self.file_handler.get_area_csv_path(area_name)
-        previous_adventure_name = self.file_handler.get_previous_adventure_name(area_name, adventure.name)
-        prev_area_name = self.file_handler.get_previous_area_name(area_name)
-        precursor_log = self.file_handler.read_adventure_log(prev_area_name, previous_adventure_name) if prev_area_name and previous_adventure_name else None
+        precursor_log = self.file_handler.get_precursor_log(area_name, adventure.name)
         chapters = adventure.chapters
         total = sum(1 for c in chapters if c and c.strip())
-        for chapter_index in range(len(chapters)):
-            if chapter_index >= len(chapters) or not chapters[chapter_index]:
-                continue
-            content = generator.generate_log(
-                area_name=area_name,
-                adventure_name=adventure.name,
-                chapter_index=chapter_index,
-                area_csv_path=area_csv_path,
-                previous_log=previous_log,
-                precursor_log=precursor_log,
-                debug=self.context.debug_mode
-            )
-            if content is None:
-                self.logger.warning(f"最終章到達: {adventure.name}")
-                break
-            if self.context.debug_mode:
-                print(content)
-            self.logger.generate(f"ログ {chapter_index+1}/{total}: {adventure.name}")
-            self.file_handler.write_text(temp_path, content, append=True)
-            previous_log = content
-        return self.file_handler.read_text(temp_path)
+        chapter_indices = [i for i, c in enumerate(chapters) if c]
+        contents: List[str] = []
+        speculate = self.config.speculative_chapter_logs
+        hits = misses = 0
+        pos = 0
+        # 前章のログに依存しない章があれば、それらは最初にまとめて並行生成しておく
+        independent = [i for i in chapter_indices if not generator.uses_previous_log(i)]
+        if len(independent) < 2:
+            independent = []
+        with ThreadPoolExecutor(max_workers=2) as executor, \
+                ThreadPoolExecutor(max_workers=max(1, self.config.max_concurrency)) as independent_executor:
+            prefetched = {}
+            for i in independent:
+                self._throttle()
+                prefetched[i] = independent_executor.submit(
+                    generator.generate_log,
+                    area_name=area_name,
+                    adventure_name=adventure.name,
+                    chapter_index=i,
+                    area_csv_path=area_csv_path,
+                    precursor_log=precursor_log,
+                    debug=self.context.debug_mode
+                )
+            while pos < len(chapter_indices):
+                chapter_index = chapter_indices[pos]
+                if chapter_index in prefetched:
+                    content = prefetched.pop(chapter_index).result()
+                    if content is None:
+                        self.logger.warning(f"最終章到達: {adventure.name}")
+                        break
+                    self._append_chapter_log(contents, content, chapter_index, total, adventure.name)
+                    previous_log = content
+                    pos += 1
+                    continue
+                # 次章を前章の概要だけで先行生成し、本生成と並行して待ち時間を重ねる
+                speculative = None
+                if speculate and pos + 1 < len(chapter_indices) and chapter_indices[pos + 1] not in prefetched:
+                    self._throttle()
+                    speculative = executor.submit(
+                        generator.generate_log_speculative,
+                        area_name=area_name,
+                        adventure_name=adventure.name,
+                        chapter_index=chapter_indices[pos + 1],
+                        area_csv_path=area_csv_path,
+                        provisional_previous=chapters[chapter_index],
+                        precursor_log=precursor_log,
+                        debug=self.context.debug_mode
+                    )
+                self._throttle()
+                content = generator.generate_log(
+                    area_name=area_name,
+                    adventure_name=adventure.name,
+                    chapter_index=chapter_index,
+                    area_csv_path=area_csv_path,
+                    previous_log=previous_log,
+                    precursor_log=precursor_log,
+                    debug=self.context.debug_mode
+                )
+                if content is None:
+                    self.logger.warning(f"最終章到達: {adventure.name}")
+                    break
+                self._append_chapter_log(contents, content, chapter_index, total, adventure.name)
+                previous_log = content
+                pos += 1
+                if speculative is None:
+                    continue
+
+                try:
+                    next_content = speculative.result()
+                except Exception:
+                    next_content = None  # 先行生成の失敗は外れとして逐次生成でやり直す
+                if next_content is not None and generator.is_continuous(content, next_content):
+                    hits += 1
+                    self._append_chapter_log(contents, next_content, chapter_indices[pos], total, adventure.name)
+                    previous_log = next_content
+                    pos += 1
+                else:
+                    misses += 1
+                    if misses / (hits + misses) > SPECULATION_MISS_RATE:
+                        self.logger.warning(f"先行生成の不一致が多いため逐次生成に切り替えます: {adventure.name}")
+                        speculate = False
+        full_log = "".join(contents)
+        self.file_handler.write_text(temp_path, full_log)
+        return full_log
+
+    def _append_chapter_log(self, contents: List[str], content: str, chapter_index: int, total: int, adventure_name: str) -> None:
+        if self.context.debug_mode:
+            print(content)
+        self.logger.generate(f"ログ {chapter_index+1}/{total}: {adventure_name}")
+        contents.append(content)
@@ -1,10 +1,14 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from functools import cached_property
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
 from pathlib import Path
-import json
 
+from src.utils.json_io import read_json
+from src.utils.substring_matcher import SubstringMatcher
 
-@dataclass
+
+@dataclass(frozen=True)
 class PathConfig:
     data_dir: Path
     check_result_dir: Path
@@ -13,24 +17,24 @@ class PathConfig:
 
 class ConfigManager:
     def __init__(self, config_path: Path):
-        self.config = self._load_json(config_path)
+        # 読み込み後に書き換えられないよう読み取り専用にしておく
+        self.config: Mapping = MappingProxyType(self._load_json(config_path))
 
     def _load_json(self, config_path: Path) -> Dict:
         if not config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
             
-        with config_path.open(encoding="utf-8") as f:
-            return json.load(f)
+        return read_json(config_path)
 
-    @property
-    def check_marks(self) -> List[str]:
-        return self.config.get("CHECK_MARKS", ["✅"])
+    @cached_property
+    def check_marks(self) -> Tuple[str, ...]:
+        return tuple(self.config.get("CHECK_MARKS", ("✅",)))
 
-    @property
+    @cached_property
     def max_retries(self) -> int:
         return self.config.get("MAX_RETRIES", 10)
 
-    @property
+    @cached_property
     def paths(self) -> PathConfig:
         return PathConfig(
             data_dir=Path(self.config["DATA_DIR"]),
@@ -39,71 +43,111 @@ class ConfigManager:
             config_file=Path(self.config["CONFIG_FILE"])
         )
 
-    @property
-    def area_check_keys(self) -> List[str]:
-        return self.config.get("AREACHECK_KEYS", [])
+    @cached_property
+    def area_check_keys(self) -> Tuple[str, ...]:
+        return tuple(self.config.get("AREACHECK_KEYS", ()))
 
-    @property
-    def adventure_check_keys(self) -> List[str]:
-        return self.config.get("ADVCHECK_KEYS", [])
+    @cached_property
+    def adventure_check_keys(self) -> Tuple[str, ...]:
+        return tuple(self.config.get("ADVCHECK_KEYS", ()))
 
-    @property
-    def locked_adventure_check_keys(self) -> List[str]:
-        return self.config.get("LOCKED_ADVCHECK_KEYS", [])
+    @cached_property
+    def locked_adventure_check_keys(self) -> Tuple[str, ...]:
+        return tuple(self.config.get("LOCKED_ADVCHECK_KEYS", ()))
 
-    @property
-    def log_check_keys(self) -> List[str]:
-        return self.config.get("LOGCHECK_KEYS", [])
+    @cached_property
+    def log_check_keys(self) -> Tuple[str, ...]:
+        return tuple(self.config.get("LOGCHECK_KEYS", ()))
 
 
-    @property
-    def location_check_keys(self) -> List[str]:
-        return self.config.get("LOCATIONCHECK_KEYS", [])
+    @cached_property
+    def location_check_keys(self) -> Tuple[str, ...]:
+        return tuple(self.config.get("LOCATIONCHECK_KEYS", ()))
 
-    @property
+    @cached_property
     def area_name_prompt(self) -> str:
         return self.config.get("AREA_NAME_PROMPT", "")
 
-    @property
-    def ng_words(self) -> List[str]:
-        return self.config.get("NG_WORDS", [])
+    @cached_property
+    def ng_words(self) -> FrozenSet[str]:
+        return frozenset(self.config.get("NG_WORDS", ()))
+
+    @cached_property
+    def ng_word_matcher(self) -> SubstringMatcher:
+        return SubstringMatcher(self.ng_words)
 
-    @property
+    @cached_property
     def result_template(self) -> str:
         return self.config.get("RESULT_TEMPLATE", "")
 
-    @property
+    @cached_property
     def area_info_text(self) -> str:
         return self.config.get("AREA_INFO_TEXT", "")
 
-    @property
+    @cached_property
     def csv_headers_area(self) -> List[str]:
         return self.config.get("CSV_HEADERS_AREA", [])
 
-    @property
+    @cached_property
     def csv_headers_adventure(self) -> List[str]:
         return self.config.get("CSV_HEADERS_ADVENTURE", [])
 
-    @property
+    @cached_property
     def csv_headers_unlocks(self) -> List[str]:
         return self.config.get("CSV_HEADERS_UNLOCKS", [])
 
-    @property
-    def chapter_settings(self) -> List[Dict]:
-        return self.config.get("CHAPTER_SETTINGS", [])
+    @cached_property
+    def chapter_settings(self) -> Tuple[Mapping, ...]:
+        return tuple(MappingProxyType(setting) for setting in self.config.get("CHAPTER_SETTINGS", ()))
 
-    @property
+    @cached_property
     def area_info_keys_for_prompt(self) -> List[str]:
         return self.config.get("AREA_INFO_KEYS_FOR_PROMPT", [])
 
-    @property
+    @cached_property
     def before_log_template(self) -> Dict[str, str]:
         return self.config.get("BEFORE_LOG_TEMPLATE", {})
 
-    @property
+    @cached_property
     def ending_line(self) -> str:
         return self.config.get("ENDING_LINE", "冒険は終了")
 
-    @property
+    @cached_property
     def item_value_table(self) -> Dict[str, int]:
         return self.config.get("ITEM_VALUE_TABLE", {})
+
+    @cached_property
+    def requests_per_minute(self) -> int:
+        return self.config.get("REQUESTS_PER_MINUTE", 0)
+
+    @cached_property
+    def tokens_per_minute(self) -> int:
+        return self.config.get("TOKENS_PER_MINUTE", 0)
+
+    @cached_property
+    def estimated_tokens_per_request(self) -> int:
+        return self.config.get("ESTIMATED_TOKENS_PER_REQUEST", 8192)
+
+    @cached_property
+    def max_concurrency(self) -> int:
+        return self.config.get("MAX_CONCURRENCY", 1)
+
+    @cached_property
+    def speculative_chapter_logs(self) -> bool:
+        return self.config.get("SPECULATIVE_CHAPTER_LOGS", False)
+
+    @cached_property
+    def csv_trusted_fast_path(self) -> bool:
+        return self.config.get("CSV_TRUSTED_FAST_PATH", False)
+
+    @cached_property
+    def parquet_sidecar(self) -> bool:
+        return self.config.get("PARQUET_SIDECAR", False)
+
+    @cached_property
+    def arrow_csv(self) -> bool:
+        return self.config.get("ARROW_CSV", False)
+
+    @cached_property
+    def random_seed(self) -> Optional[int]:
+        return self.config.get("RANDOM_SEED")
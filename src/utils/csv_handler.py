@@ -1,10 +1,22 @@
+import io
+from contextlib import contextmanager
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Tuple
 import csv
 
+from src.utils.atomic_write import atomic_write_bytes
+
+APPEND_BUFFER_SIZE = 128 * 1024
+IO_BUFFER_SIZE = 1 << 20
+_RESULT_RANK = {'失敗': 0, '成功': 1, '大成功': 2}
+
 class CSVHandler:
-    def __init__(self):
+    def __init__(self, trusted_fast_path: bool = False):
         self.current_path = None
+        # 自前で書き出したCSVだけを読む場合、引用符のない行は str.split で済ませる
+        self.trusted_fast_path = trusted_fast_path
 
     def write_headers(self, file_path: Path, headers: List[str]):
         self.current_path = file_path
@@ -13,91 +25,165 @@ class CSVHandler:
             writer = csv.writer(f)
             writer.writerow(headers)
 
+    def iter_rows(self, file_path: Path) -> Iterator[Dict]:
+        self.current_path = file_path
+        # exists() で確認せず、開けなければ空として扱う（stat を1回減らす）
+        try:
+            file = file_path.open('r', encoding='utf-8', newline='', buffering=IO_BUFFER_SIZE)
+        except FileNotFoundError:
+            return
+
+        with file:
+            yield from csv.DictReader(file)
+
     def read_rows(self, file_path: Path) -> List[Dict]:
+        return list(self.iter_rows(file_path))
+
+    @contextmanager
+    def _open_table(self, file_path: Path):
+        """ヘッダーと、残りの行を1行ずつ返す reader を渡します。空行は読み飛ばします。"""
+        with file_path.open('r', encoding='utf-8', newline='', buffering=IO_BUFFER_SIZE) as file:
+            reader = self._fast_reader(file) if self.trusted_fast_path else csv.reader(file)
+            yield next(reader, []), (row for row in reader if row)
+
+    @staticmethod
+    def _fast_reader(file) -> Iterator[List[str]]:
+        for line in file:
+            if '"' in line:
+                # 引用符を含む行だけは csv モジュールに任せる（複数行にまたがる値も続きの行から読む）
+                yield next(csv.reader(chain([line], file)))
+                continue
+            line = line.rstrip('\r\n')
+            yield line.split(',') if line else []
+
+    def read_table(self, file_path: Path) -> Tuple[List[str], List[List[str]]]:
+        """ヘッダーと行を辞書にせず、列の並びのまま読み込みます。"""
         self.current_path = file_path
-        if not file_path.exists():
+        try:
+            with self._open_table(file_path) as (headers, rows):
+                return headers, list(rows)
+        except FileNotFoundError:
+            return [], []
+
+    def read_rows_fast(self, file_path: Path, usecols: Optional[List[str]] = None) -> List[Dict]:
+        import pandas as pd
+
+        # 読み取り専用の検索用。Cパーサで必要な列だけを読み、空欄は read_rows と同じく "" にする
+        try:
+            # 0バイトのファイルは mmap できないので、read_rows と同じく空として扱う
+            if file_path.stat().st_size == 0:
+                return []
+        except FileNotFoundError:
             return []
-            
-        with file_path.open('r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            return [row for row in reader]
+        # 列名のリストだと存在しない列でエラーになるので、あるものだけを選ぶ関数で渡す
+        wanted = None if usecols is None else frozenset(usecols).__contains__
+        try:
+            df = pd.read_csv(file_path, engine="c", memory_map=True, dtype=str, keep_default_na=False, usecols=wanted)
+        except pd.errors.EmptyDataError:
+            return []
+        return df.to_dict(orient="records")
     
     def read_adventures(self, file_path: Path):
         self.current_path = file_path
         if not file_path.exists():
             raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
 
-        for row in self.read_rows(file_path):
-            adventure_name = row["冒険名"]
-            prev_adventure = row["前の冒険"]
-            next_adventure = row["次の冒険"]
-            result = row["結果"]
-            chapters = [row.get(f"{i}章", "") for i in range(1, 9)]
-            item = row.get("アイテム", row.get("item", ""))
-            yield adventure_name, prev_adventure, next_adventure, result, chapters, item
-
-    def write_row(self, file_path: Path, row: List[str], headers: List[str] = None):
+        with self._open_table(file_path) as (headers, rows):
+            # 空のファイルやヘッダーのないファイルは、DictReader と同じく何も返さない
+            if not headers:
+                return
+            index = {header: i for i, header in enumerate(headers)}
+            name_i, prev_i, next_i, result_i = (index.get(key) for key in ("冒険名", "前の冒険", "次の冒険", "結果"))
+            chapter_indices = [index.get(f"{i}章") for i in range(1, 9)]
+            item_i = index.get("アイテム", index.get("item"))
+
+            # 1章〜8章が連続した列なら、行ごとにスライス1回で章を取り出す
+            chapters_start = chapter_indices[0]
+            contiguous = chapters_start is not None and chapter_indices == list(range(chapters_start, chapters_start + 8))
+
+            def cell(row: List[str], i: Optional[int]) -> str:
+                return row[i] if i is not None and i < len(row) else ""
+
+            for row in rows:
+                if contiguous:
+                    chapters = row[chapters_start:chapters_start + 8]
+                    chapters += [""] * (8 - len(chapters))
+                else:
+                    chapters = [cell(row, i) for i in chapter_indices]
+                yield cell(row, name_i), cell(row, prev_i), cell(row, next_i), cell(row, result_i), chapters, cell(row, item_i)
+
+    @contextmanager
+    def batch_append(self, file_path: Path, headers: List[str] = None):
+        """ファイルを一度だけ開き、複数行をまとめて追記する writer を渡します。"""
         self.current_path = file_path
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        
+
         file_exists = file_path.exists()
-        with file_path.open("a", encoding="utf-8", newline="") as f:
+        with file_path.open("a", encoding="utf-8", newline="", buffering=APPEND_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             if not file_exists and headers:
                 writer.writerow(headers)
+            yield writer
+
+    def write_row(self, file_path: Path, row: List[str], headers: List[str] = None):
+        with self.batch_append(file_path, headers) as writer:
             writer.writerow(row)
 
     def sort_by_result(self, file_path: Path):
         self.current_path = file_path
-        rows = self.read_rows(file_path)
-        sorted_rows = sorted(
-            rows,
-            key=lambda x: (
-                {'失敗': 0, '成功': 1, '大成功': 2}.get(x.get('結果', ''), 3),
-                int(x.get('番号', 0))
+        headers, rows = self.read_table(file_path)
+        result_i = headers.index('結果') if '結果' in headers else None
+        number_i = headers.index('番号') if '番号' in headers else None
+        # 各行のキーは一度だけ計算し、比較は itemgetter に任せる
+        keyed = [
+            (
+                _RESULT_RANK.get(row[result_i] if result_i is not None and result_i < len(row) else '', 3),
+                int((row[number_i] if number_i is not None and number_i < len(row) else 0) or 0),
+                row
             )
-        )
-        self._write_sorted_rows(sorted_rows)
+            for row in rows
+        ]
+        keyed.sort(key=itemgetter(0, 1))
+        sorted_rows = [row for _, _, row in keyed]
+        self._write_sorted_rows(headers, sorted_rows, file_path)
 
-    def _write_sorted_rows(self, rows: List[Dict]) -> None:
+    def _write_sorted_rows(self, headers: List[str], rows: List[List[str]], file_path: Optional[Path] = None) -> None:
         if not rows:
             return
             
-        rows = [{k: ("" if v is None else v) for k, v in row.items() if k is not None} for row in rows]
-        headers = list(rows[0].keys())
-        with self.current_path.open('w', encoding='utf-8', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(rows)
-
-    def _write_all_rows(self, file_path: Path, rows: List[Dict], headers: Optional[List[str]] = None) -> None:
+        # 同じインスタンスを複数スレッドで共有しても current_path に依存しないよう、パスは明示的に受け取る
+        file_path = file_path or self.current_path
+        atomic_write_bytes(file_path, self._to_csv_bytes(headers, rows))
+
+    @staticmethod
+    def _to_csv_bytes(headers: List[str], rows: List[List[str]]) -> bytes:
+        # 行ごとの小さな write を避け、全体をメモリ上で組み立ててから一度に書き込む
+        buffer = io.StringIO(newline='')
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        writer.writerows(rows)
+        return buffer.getvalue().encode('utf-8')
+
+    def _write_all_rows(self, file_path: Path, rows: List[List[str]], headers: Optional[List[str]] = None) -> None:
         """指定された行リストをCSVファイルに上書きします。ヘッダーも書き込みます。"""
         self.current_path = file_path
         file_path.parent.mkdir(parents=True, exist_ok=True)
 
-        if not headers and rows:
-            headers = list(rows[0].keys())
-        elif not headers and not rows:
+        if not headers and not rows:
             # ヘッダーもなく、データもない場合はファイルを空にする
             file_path.open('w').close()
             return
+        elif not headers:
+            # 行は列の並びだけを持つので、ヘッダーは呼び出し側から受け取る必要がある
+            print(f"エラー: ヘッダーが決定できませんでした。ファイル '{file_path}' への書き込みを中止します。")
+            return
         elif not rows:
-             # データはなくヘッダーはある場合、ヘッダーのみ書き込む
-             self.write_headers(file_path, headers)
-             return
-
-        # この時点で headers は必ず存在するはず
-        if not headers:
-             # 万が一 headers が None のままここに来た場合のフォールバック
-             print(f"エラー: ヘッダーが決定できませんでした。ファイル '{file_path}' への書き込みを中止します。")
-             return
+            # データはなくヘッダーはある場合、ヘッダーのみ書き込む
+            self.write_headers(file_path, headers)
+            return
 
         try:
-            rows = [{k: ("" if v is None else v) for k, v in row.items() if k is not None} for row in rows]
-            with file_path.open('w', encoding='utf-8', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=headers)
-                writer.writeheader()
-                writer.writerows(rows)
+            atomic_write_bytes(file_path, self._to_csv_bytes(headers, rows))
         except Exception as e:
             print(f"ファイル書き込み中にエラーが発生しました ({file_path}): {e}")
             # 必要であればここで例外を再発生させる
@@ -115,18 +201,21 @@ class CSVHandler:
         CSVファイルを読み込み、指定された列1の値がtarget_valueと一致する場合、
         その行の列2の値をnew_valueに更新して上書き保存します。
         """
-        rows = self.read_rows(file_path)
-        if not rows:
-            # ファイルが空、または読み込みに失敗した場合(read_rowsが[]を返す)
-            # この時点ではヘッダーが不明なため、列名チェックはできない
+        import pandas as pd
+
+        self.current_path = file_path
+        try:
+            df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            df = None
+        if df is None or df.empty:
+            # ファイルが空、またはデータ行がない場合
             # 更新対象もないので、処理を終了
             print(f"ファイル '{file_path}' が空か、読み込めませんでした。更新は行われません。")
             return
 
-        # ヘッダーを取得 (rowsが空でないことは保証されている)
-        original_headers = list(rows[0].keys())
-
         # --- 列名の存在チェック ---
+        original_headers = list(df.columns)
         missing_cols = []
         if col1_name not in original_headers:
             missing_cols.append(col1_name)
@@ -137,30 +226,16 @@ class CSVHandler:
             # --- 指定された列名が存在しない場合は ValueError を raise ---
             raise ValueError(f"指定された列名が見つかりません: {missing_cols}. 利用可能なヘッダー: {original_headers}")
 
-        # --- 行の更新処理 ---
-        updated = False
-        updated_rows = []
-        for i, row in enumerate(rows):
-            if isinstance(row, dict):
-                current_value_col1 = row.get(col1_name) # getで安全にアクセス
-                if current_value_col1 == target_value:
-                    row[col2_name] = new_value
-                    updated = True
-                updated_rows.append(row)
-            else:
-                # 通常発生しないはずだが念のため
-                print(f"警告: 行 {i+1} は予期される辞書形式ではありません: {row}")
-                updated_rows.append(row) # スキップせず元の行を追加
+        # --- 行の更新処理 (列全体をまとめて比較する) ---
+        mask = df[col1_name] == target_value
+        if not mask.any():
+            print(f"'{col1_name}' が '{target_value}' である行は見つかりませんでした。ファイル '{file_path}' は変更されていません。")
+            return
+        df.loc[mask, col2_name] = new_value
 
         # --- 書き込み処理 ---
-        if updated:
-            try:
-                # _write_all_rows は内部で書き込みエラーをprintするが、
-                # 必要ならここで再度 try-except し、例外を上に投げることもできる
-                self._write_all_rows(file_path, updated_rows, headers=original_headers)
-            except Exception as e:
-                # _write_all_rows 内でのエラーをここでキャッチして再raiseするなど
-                print(f"ファイル書き込み処理中に予期せぬエラーが発生しました: {e}")
-                raise # エラーを呼び出し元に伝える
-        else:
-            print(f"'{col1_name}' が '{target_value}' である行は見つかりませんでした。ファイル '{file_path}' は変更されていません。")
\ No newline at end of file
+        try:
+            atomic_write_bytes(file_path, df.to_csv(index=False).encode('utf-8'))
+        except Exception as e:
+            print(f"ファイル書き込み処理中に予期せぬエラーが発生しました: {e}")
+            raise # エラーを呼び出し元に伝える
@@ -1,43 +1,122 @@
 from pathlib import Path
-from typing import Optional, List, Iterator, Dict
-from dataclasses import dataclass
-import json
+from typing import TYPE_CHECKING, Any, Callable, Optional, List, Iterator, Dict, Set, Tuple
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import csv
+import os
 import re
+import shutil
+import uuid
 
-import pandas as pd
+from src.utils.atomic_write import atomic_write_bytes
+from src.utils.json_io import read_json, write_json, append_jsonl, read_jsonl, JSONDecodeError
+
+if TYPE_CHECKING:
+    # pandas は読み込みに時間がかかるので、DataFrame を扱うメソッドの中で初めて import する
+    import pandas as pd
 
 USER_DATA_FILE = Path("user_data") / "history.json"
+# 冒険履歴は1件ずつ追記し、ある程度たまったら USER_DATA_FILE にまとめる
+HISTORY_LOG_FILE = Path("user_data") / "history_log.jsonl"
+HISTORY_COMPACT_BYTES = 256 * 1024
+# まとめる直前に追記ファイルをこの名前へ移し、その後の追記は新しい追記ファイルに入るようにする
+HISTORY_STAGING_GLOB = "history_log.*.staging.jsonl"
+READ_TEXT_CHUNK_SIZE = 64 * 1024
+# パスを組み立てるメソッドの結果を使い回す件数。URL から来たエリア名などで際限なく増えないよう上限を設ける
+PATH_CACHE_SIZE = 4096
+# 読み込み結果を (元ファイルの更新時刻とサイズ, 値) で覚えておく。ビューアは再実行ごとに FileHandler を作り直すので、
+# インスタンスではなくモジュールで持ち、再実行をまたいで使い回す
+_FILE_CACHE: Dict[Any, Tuple[tuple, Any]] = {}
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def _child_path(base: Path, *parts: str) -> Path:
+    # インスタンスメソッドに lru_cache を付けると FileHandler ごとキャッシュに残るので、ディレクトリをキーにする
+    return base.joinpath(*parts)
+
 @dataclass
 class FileStructure:
     data_dir: Path
     check_result_dir: Path
     prompt_dir: Path
 
+@dataclass
+class DeletionPlan:
+    """削除の連鎖で発生するCSV更新を集め、ファイルごとに一度だけ書き換えるための計画。"""
+    drops: Dict[Path, Dict[str, Set[str]]] = field(default_factory=dict)
+    pattern_drops: Dict[Path, Dict[str, Set[str]]] = field(default_factory=dict)
+    resets: Dict[Path, Dict[str, Set[str]]] = field(default_factory=dict)
+    removed_areas: List[str] = field(default_factory=list)
+
+    def drop(self, path: Path, column: str, values: List[str]) -> None:
+        self.drops.setdefault(path, {}).setdefault(column, set()).update(values)
+
+    def drop_matching(self, path: Path, column: str, values: List[str]) -> None:
+        self.pattern_drops.setdefault(path, {}).setdefault(column, set()).update(values)
+
+    def reset(self, path: Path, column: str, values: List[str]) -> None:
+        self.resets.setdefault(path, {}).setdefault(column, set()).update(values)
+
+    def remove_area(self, area: str) -> None:
+        if area not in self.removed_areas:
+            self.removed_areas.append(area)
+
 class FileHandler:
     def __init__(self, file_structure: FileStructure, config_manager):
         self.structure = file_structure
         self.config_manager = config_manager
+        # (用語辞書, 用語数, 用語を長い順に並べて結合した正規表現)
+        self._terms_pattern_cache: Optional[Tuple[Dict[str, str], int, Optional["re.Pattern"]]] = None
         self._ensure_directories()
 
+    def _mtime_cached(self, key: Any, paths: List[Path], loader: Callable[[], Any]) -> Any:
+        # 元ファイルの更新時刻とサイズが前回と同じなら、読み込み結果を使い回す
+        # (呼び出し側で書き換えられないよう、返す側でコピーを渡すこと)
+        key = (self.structure.data_dir, self.structure.check_result_dir, key)
+        try:
+            stamp = tuple((path, st.st_mtime_ns, st.st_size) for path in paths for st in [path.stat()])
+        except FileNotFoundError:
+            _FILE_CACHE.pop(key, None)
+            return loader()
+        cached = _FILE_CACHE.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        value = loader()
+        _FILE_CACHE[key] = (stamp, value)
+        return value
+
     def _ensure_directories(self) -> None:
         for directory in [self.structure.data_dir, 
                          self.structure.check_result_dir, 
                          self.structure.prompt_dir]:
             directory.mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def _scan_lv_csv(directory: Path) -> List[Path]:
+        # lv*.csv はディレクトリ直下にしか置かないので、サブフォルダまで辿らない
+        try:
+            with os.scandir(directory) as entries:
+                return [
+                    Path(entry.path) for entry in entries
+                    if entry.name.startswith('lv') and entry.name.endswith('.csv') and entry.is_file(follow_symlinks=False)
+                ]
+        except FileNotFoundError:
+            return []
+
     def get_all_areas_csv_path(self) -> List[Path]:
-        return list(self.structure.data_dir.rglob('lv*.csv'))
+        return self._scan_lv_csv(self.structure.data_dir)
 
     def get_lv_areas_csv_path(self, lv: int) -> Path:
         if not lv:
             return Path("none")
-        return self.structure.data_dir / f"lv{lv}.csv"
+        return _child_path(self.structure.data_dir, f"lv{lv}.csv")
 
     def get_lv_check_areas_csv_path(self, lv: int) -> Path:
         if not lv:
             return Path("none")
-        return self.structure.check_result_dir / f"lv{lv}.csv"
+        return _child_path(self.structure.check_result_dir, f"lv{lv}.csv")
 
     def get_areas_dir(self) -> Path:
         return self.structure.data_dir
@@ -45,54 +124,60 @@ class FileHandler:
     def get_area_path(self, area_name: str) -> Path:
         if not area_name:
             return Path("none")
-        return self.structure.data_dir / area_name
+        return _child_path(self.structure.data_dir, area_name)
 
     def get_area_csv_path(self, area_name: str) -> Path:
         if not area_name:
             return Path("none")
-        return self.get_area_path(area_name) / f"{area_name}.csv"
+        return _child_path(self.structure.data_dir, area_name, f"{area_name}.csv")
 
     def get_adventure_path(self, area_name: str, adventure_name: str) -> Path:
         if not area_name or not adventure_name:
             return Path("none")
-        return self.get_area_path(area_name) / f"{adventure_name}.txt"
+        return _child_path(self.structure.data_dir, area_name, f"{adventure_name}.txt")
 
     def get_location_path(self, area_name: str, adventure_name: str) -> Path:
         if not area_name or not adventure_name:
             return Path("none")
-        return self.get_area_path(area_name) / f"loc_{adventure_name}.txt"
+        return _child_path(self.structure.data_dir, area_name, f"loc_{adventure_name}.txt")
 
     def get_check_area_path(self, area_name: str) -> Path:
         if not area_name:
             return Path("none")
-        return self.structure.check_result_dir / area_name
+        return _child_path(self.structure.check_result_dir, area_name)
 
     def get_check_path(self, area_name: str, check_type: str) -> Path:
         if not area_name:
             return Path("none")
-        return self.structure.check_result_dir / area_name / f"{check_type}_{area_name}.csv"
+        return _child_path(self.structure.check_result_dir, area_name, f"{check_type}_{area_name}.csv")
 
     def get_all_areas_check_path(self) -> List[Path]:
-        return list(self.structure.check_result_dir.glob('lv*.csv'))
+        return self._scan_lv_csv(self.structure.check_result_dir)
 
     def get_previous_adventure_name(self, area_name: str, adventure_name: str) -> Optional[str]:
-        area_df = self.load_area_csv(area_name)
-        if area_df is not None and adventure_name in area_df["冒険名"].values:
-            return area_df[area_df["冒険名"] == adventure_name]["前の冒険"].values[0]
-        return None
+        return self._lookup(self._read_rows(self.get_area_csv_path(area_name)), "冒険名", adventure_name, "前の冒険")
 
     def get_previous_area_name(self, area_name: str) -> Optional[str]:
-        area_df = self.load_areas_csv()
-        if area_df is not None and area_name in area_df["エリア名"].values:
-            return area_df[area_df["エリア名"] == area_name]["前のエリア"].values[0]
-        return None
+        return self._lookup(self._read_areas_rows(), "エリア名", area_name, "前のエリア")
 
     def get_next_area_name(self, area_name: str) -> Optional[str]:
-        area_df = self.load_areas_csv()
-        if area_df is not None and area_name in area_df["エリア名"].values:
-            return area_df[area_df["エリア名"] == area_name]["次のエリア"].values[0]
+        return self._lookup(self._read_areas_rows(), "エリア名", area_name, "次のエリア")
+
+    @staticmethod
+    def _lookup(rows: List[Dict[str, str]], key_column: str, key: str, value_column: str) -> Optional[str]:
+        for row in rows:
+            if row.get(key_column) == key:
+                return row.get(value_column)
         return None
 
+    @staticmethod
+    def _lookup_frame(df: "pd.DataFrame", key_column: str, key: str, value_column: str) -> Any:
+        """DataFrame 版の _lookup。絞り込んだ DataFrame を作らず、列の配列上で最初に一致した行の値を返します。"""
+        mask = df[key_column].to_numpy() == key
+        if not mask.any():
+            return None
+        return df[value_column].to_numpy()[mask.argmax()]
+
     def get_area_name(self, adventure_name: str) -> Optional[str]:
         if '_' in adventure_name:
             result_num, area_name = adventure_name.split('_')
@@ -108,118 +193,195 @@ class FileHandler:
         lv_areas_data = {}
         for lv_areas_csv_path in lv_areas_csv_paths:
             stem = lv_areas_csv_path.stem
-            if lv_areas_csv_path.exists():
-                lv_areas_data[stem] = pd.read_csv(lv_areas_csv_path)
+            try:
+                lv_areas_data[stem] = self._mtime_cached(lv_areas_csv_path, [lv_areas_csv_path], lambda: self._read_tabular(lv_areas_csv_path)).copy()
+            except FileNotFoundError:
+                continue
         return lv_areas_data
 
-    def load_areas_csv(self) -> pd.DataFrame:
+    def _read_tabular(self, csv_path: Path) -> "pd.DataFrame":
+        """CSVを読み込む。PARQUET_SIDECAR が有効なら、CSVより新しい .parquet があればそちらを読む。"""
+        import pandas as pd
+
+        if not self.config_manager.parquet_sidecar:
+            return self._read_csv(csv_path)
+        parquet_path = csv_path.with_suffix(".parquet")
+        try:
+            if parquet_path.stat().st_mtime_ns > csv_path.stat().st_mtime_ns:
+                return pd.read_parquet(parquet_path)
+        except (FileNotFoundError, ImportError):
+            pass
+        df = self._read_csv(csv_path)
+        try:
+            df.to_parquet(parquet_path, compression="zstd")
+        except Exception:
+            # pyarrow が無い、型が混在しているなどで書けない場合は CSV だけを使う
+            parquet_path.unlink(missing_ok=True)
+        return df
+
+    def _read_csv(self, csv_path: Path) -> "pd.DataFrame":
+        import pandas as pd
+
+        if self.config_manager.arrow_csv:
+            # ARROW_CSV が有効なら pyarrow のマルチスレッドのパーサで読む。入っていなければ標準のエンジンで読む
+            try:
+                return pd.read_csv(csv_path, engine="pyarrow")
+            except ImportError:
+                pass
+        return pd.read_csv(csv_path)
+
+    def load_areas_csv(self) -> "pd.DataFrame":
         areas_csv_paths = self.get_all_areas_csv_path()
+        return self._mtime_cached("areas", areas_csv_paths, lambda: self._concat_areas_csv(areas_csv_paths)).copy()
+
+    def _concat_areas_csv(self, areas_csv_paths: List[Path]) -> "pd.DataFrame":
+        import pandas as pd
+
+        if self.config_manager.arrow_csv and not self.config_manager.parquet_sidecar:
+            try:
+                return self._concat_arrow_csv(areas_csv_paths)
+            except (ImportError, ValueError):
+                # pyarrow が無い、またはファイル間で列の型が合わない場合は pandas で読む
+                pass
         dfs = []
         for areas_csv_path in areas_csv_paths:
             if areas_csv_path.exists():
                 # CSVを結合して返す
-                df = pd.read_csv(areas_csv_path)
+                df = self._read_tabular(areas_csv_path)
                 dfs.append(df)
 
         # 全てのDataFrameを縦に結合（行方向に）
         combined_df = pd.concat(dfs, ignore_index=True)
         return combined_df
 
-    def load_area_csv(self, area_name: str) -> pd.DataFrame:
+    @staticmethod
+    def _concat_arrow_csv(csv_paths: List[Path]) -> "pd.DataFrame":
+        """各CSVを Arrow のテーブルとして読み、結合してから一度だけ DataFrame に変換します。"""
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        # 空欄は pd.read_csv と同じく欠損値として扱う
+        convert_options = pacsv.ConvertOptions(strings_can_be_null=True)
+        tables = [pacsv.read_csv(path, convert_options=convert_options) for path in csv_paths if path.exists()]
+        return pa.concat_tables(tables).to_pandas()
+
+    def load_area_csv(self, area_name: str) -> "pd.DataFrame":
         if area_name is None:
             return None
         area_csv_path = self.get_area_csv_path(area_name)
-        return pd.read_csv(area_csv_path) if area_csv_path.exists() else None
+        try:
+            return self._mtime_cached(area_csv_path, [area_csv_path], lambda: self._read_tabular(area_csv_path)).copy()
+        except FileNotFoundError:
+            return None
 
-    def load_area_adventures(self, area_name: str) -> List[str]:
-        area_csv = self.get_area_csv_path(area_name)
-        if not area_csv.exists():
+    def _read_rows(self, csv_path: Path) -> List[Dict[str, str]]:
+        """数十行程度のCSVは pandas を通さず csv.DictReader で読む。結果は共有されるので書き換えないこと。"""
+        def load() -> List[Dict[str, str]]:
+            with csv_path.open("r", encoding="utf-8", newline="") as f:
+                return list(csv.DictReader(f))
+
+        try:
+            return self._mtime_cached(("rows", csv_path), [csv_path], load)
+        except FileNotFoundError:
             return []
-            
-        df = pd.read_csv(area_csv)
-        return df["冒険名"].tolist() if "冒険名" in df.columns else []
+
+    def _read_areas_rows(self) -> List[Dict[str, str]]:
+        return [row for areas_csv_path in self.get_all_areas_csv_path() for row in self._read_rows(areas_csv_path)]
+
+    def _read_csv_column(self, csv_path: Path, column: str) -> List[str]:
+        # 列が存在しない場合は空のリストになる
+        return [row[column] for row in self._read_rows(csv_path) if column in row]
+
+    def load_area_adventures(self, area_name: str) -> List[str]:
+        return self._read_csv_column(self.get_area_csv_path(area_name), "冒険名")
 
     def load_area_adventures_with_result_and_prevadv(self, area_name: str) -> List[str]:
         area_csv = self.get_area_csv_path(area_name)
         if not area_csv.exists():
             return []
             
-        df = pd.read_csv(area_csv)
+        df = self._read_csv(area_csv)
         if "冒険名" in df.columns and "結果" in df.columns:
-            for index, row in df.iterrows():
-                yield row["冒険名"], row["結果"], row["前の冒険"]
+            # 行ごとに Series を作る iterrows ではなく、列を直接たどる
+            yield from zip(df["冒険名"], df["結果"], df["前の冒険"])
         else:
             return []
 
     def load_all_area_names(self) -> List[str]:
-        df = self.load_areas_csv()
-        if df is None:
-            return []
-        return df["エリア名"].tolist() if "エリア名" in df.columns else []
+        return [
+            area_name
+            for areas_csv_path in self.get_all_areas_csv_path()
+            for area_name in self._read_csv_column(areas_csv_path, "エリア名")
+        ]
 
     def load_prev_area_names(self) -> List[str]:
-        df = self.load_areas_csv()
-        if df is not None:
-            # 値が "なし" でない行のみ抽出してリストに変換
-            return df.loc[df["前のエリア"] != "なし", "前のエリア"].tolist()
-        else:
-            return []
+        # 値が "なし" でない行のみ抽出してリストに変換
+        return [row["前のエリア"] for row in self._read_areas_rows() if row.get("前のエリア", "なし") != "なし"]
 
     def load_next_area_names(self, area_name: str) -> List[str]:
-        df = self.load_areas_csv()
-        return df[(df["エリア名"] == area_name) & (df["次のエリア"] != "なし")]["次のエリア"].tolist() if df is not None else []
+        return [
+            row["次のエリア"] for row in self._read_areas_rows()
+            if row.get("エリア名") == area_name and row.get("次のエリア", "なし") != "なし"
+        ]
 
     def load_next_adventure_names(self, area_name: str, adventure_name: str) -> List[str]:
-        df = self.load_area_csv(area_name)
-        return df[(df["冒険名"] == adventure_name) & (df["次の冒険"] != "なし")]["次の冒険"].tolist() if df is not None else []
+        return [
+            row["次の冒険"] for row in self._read_rows(self.get_area_csv_path(area_name))
+            if row.get("冒険名") == adventure_name and row.get("次の冒険", "なし") != "なし"
+        ]
 
     def load_noprev_area_names(self) -> List[str]:
-        df = self.load_areas_csv()
-        return df[df["前のエリア"] == "なし"]["エリア名"].tolist() if df is not None else []
+        return [row["エリア名"] for row in self._read_areas_rows() if row.get("前のエリア") == "なし"]
 
     def load_prevexist_area_names(self):
-        df = self.load_areas_csv()
-        return df[df["前のエリア"] != "なし"]["エリア名"].tolist() if df is not None else []
+        return [row["エリア名"] for row in self._read_areas_rows() if row.get("前のエリア", "なし") != "なし"]
 
     def load_nonext_area_name_and_lv(self):
         df = self.load_areas_csv()
         
-        # "次のエリア" が "なし" の行をフィルタリング
-        nonext_df = df[df["次のエリア"] == "なし"].copy() 
+        # "次のエリア" が "なし" の行だけを、DataFrame を作らずに配列で取り出す
+        nonext_mask = df["次のエリア"].to_numpy() == "なし"
+        area_names = df["エリア名"].to_numpy()[nonext_mask]
 
-        if nonext_df.empty:
+        if len(area_names) == 0:
             return None, None # 対象エリアがない場合はNoneを返す
 
-        # "難易度" カラムから数値部分を抽出して新しい 'lv' カラムを作成
+        # "難易度" カラムから数値部分を抽出する
         # 例: "10:easy" -> 10
         try:
-            nonext_df['lv_numeric'] = nonext_df['難易度'].apply(lambda x: int(str(x).split(':')[0]))
+            lvs = [int(str(x).split(':')[0]) for x in df["難易度"].to_numpy()[nonext_mask]]
         except ValueError as e:
             print(f"難易度カラムの解析中にエラーが発生しました: {e}")
             return None, None # 解析エラー時はNoneを返す
 
-        # 'lv_numeric' カラムで昇順にソート
-        sorted_nonext_df = nonext_df.sort_values(by='lv_numeric', ascending=True)
-
-        # ソート後、最初の行（一番lvの低いエリア）の情報を取得
-        lowest_lv_area_info = sorted_nonext_df.iloc[0]
-        
-        area_name = lowest_lv_area_info["エリア名"]
-        difficulty = int(lowest_lv_area_info["lv_numeric"]) # 既に数値なのでそのままキャスト
-
-        return area_name, difficulty
+        # 一番lvの低いエリア（同じlvなら先に現れたもの）を選ぶ
+        lowest_i = min(range(len(lvs)), key=lvs.__getitem__)
+        return area_names[lowest_i], lvs[lowest_i]
 
-    def load_check_csv(self, area_name: str, check_type: str) -> pd.DataFrame:
+    def load_check_csv(self, area_name: str, check_type: str) -> "pd.DataFrame":
         check_csv_path = self.get_check_path(area_name, check_type)
-        return pd.read_csv(check_csv_path) if check_csv_path.exists() else None
+        try:
+            return self._mtime_cached(check_csv_path, [check_csv_path], lambda: self._read_tabular(check_csv_path)).copy()
+        except FileNotFoundError:
+            return None
 
-    def load_all_areas_check_csv(self) -> pd.DataFrame:
+    def load_all_areas_check_csv(self) -> "pd.DataFrame":
         check_csv_paths = self.get_all_areas_check_path()
+        return self._mtime_cached("areas_check", check_csv_paths, lambda: self._concat_check_csv(check_csv_paths)).copy()
+
+    def _concat_check_csv(self, check_csv_paths: List[Path]) -> "pd.DataFrame":
+        import pandas as pd
+
+        if self.config_manager.arrow_csv and not self.config_manager.parquet_sidecar:
+            try:
+                return self._concat_arrow_csv(check_csv_paths)
+            except (ImportError, ValueError):
+                pass
         dfs = []
         for check_csv_path in check_csv_paths:
             if check_csv_path.exists():
                 # CSVを結合して返す
-                df = pd.read_csv(check_csv_path)
+                df = self._read_tabular(check_csv_path)
                 dfs.append(df)
 
         # 全てのDataFrameを縦に結合（行方向に）
@@ -229,27 +391,68 @@ class FileHandler:
     def load_valid_areas(self) -> list[str]:
         """有効なエリア一覧をCSVから読み込み、対応するCSVファイルが存在するエリアのみ返す。"""
         areas_files = self.get_all_areas_csv_path()
+        # エリアフォルダの一覧は1回の scandir で取り、フォルダがある名前だけCSVの有無を確かめる
+        area_dirs = self.list_area_dirs()
         valid_areas = []
         for areas_file in areas_files:
-            with areas_file.open("r", encoding="utf-8") as f:
-                for row in csv.reader(f):
-                    if row:
-                        area = row[0].strip()
-                        if self.get_area_csv_path(area).exists():
+            with areas_file.open("r", encoding="utf-8", newline="") as f:
+                reader = csv.reader(f)
+                # ヘッダー行はエリア名として扱わず、"エリア名" 列の位置だけを読み取る
+                headers = next(reader, [])
+                name_i = headers.index("エリア名") if "エリア名" in headers else 0
+                for row in reader:
+                    if len(row) > name_i:
+                        area = row[name_i].strip()
+                        if area in area_dirs and self.get_area_csv_path(area).exists():
                             valid_areas.append(area)
         return valid_areas
 
     def load_nonext_adventures(self, area_name: str):
-        df_area = self.load_area_csv(area_name)
-        return df_area[df_area["次の冒険"] == "なし"]["冒険名"].tolist() if df_area is not None else []
+        return [row["冒険名"] for row in self._read_rows(self.get_area_csv_path(area_name)) if row.get("次の冒険") == "なし"]
+
+    def _list_area_txt_stems(self, area_name: str) -> List[str]:
+        try:
+            with os.scandir(self.get_area_path(area_name)) as entries:
+                return [entry.name[:-4] for entry in entries if entry.name.endswith(".txt")]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    def list_adventure_logs(self, area_name: str) -> set[str]:
+        return {stem for stem in self._list_area_txt_stems(area_name) if not stem.startswith("loc_")}
+
+    def list_location_files(self, area_name: str) -> set[str]:
+        return {stem.removeprefix("loc_") for stem in self._list_area_txt_stems(area_name) if stem.startswith("loc_")}
+
+    def get_precursor_log(self, area_name: str, adventure_name: str) -> Optional[str]:
+        # 前のエリアがなければ前の冒険を調べるまでもない
+        prev_area_name = self.get_previous_area_name(area_name)
+        if not prev_area_name or prev_area_name == "なし":
+            return None
+        previous_adventure_name = self.get_previous_adventure_name(area_name, adventure_name)
+        if not previous_adventure_name or previous_adventure_name == "なし":
+            return None
+        return self.read_adventure_log(prev_area_name, previous_adventure_name)
 
     def read_adventure_log(self, area_name: str, adventure_name: str) -> Optional[str]:
         return self.read_text(self.get_adventure_path(area_name, adventure_name))
 
     def read_text(self, file_path: Path) -> Optional[str]:
-        if not file_path.exists():
+        # 冒険ログは小さいので、テキストI/Oのラッパーを通さず一度の read で読み切る
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except FileNotFoundError:
             return None
-        return file_path.read_text(encoding='utf-8')
+        try:
+            size = os.fstat(fd).st_size
+            chunks = [os.read(fd, size)] if size else []
+            # 読んでいる間に追記されていた場合に備え、EOF まで読む
+            while chunk := os.read(fd, READ_TEXT_CHUNK_SIZE):
+                chunks.append(chunk)
+        finally:
+            os.close(fd)
+        # read_text(encoding='utf-8') と同じく改行を \n にそろえる
+        text = b"".join(chunks).decode('utf-8')
+        return text.replace('\r\n', '\n').replace('\r', '\n') if '\r' in text else text
 
     def write_text(self, file_path: Path, content: str, append: bool = False) -> None:
         file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -260,9 +463,12 @@ class FileHandler:
         deletion_log = []
         for adventure_name in adventure_names:
             for file_path in self._get_adventure_files(area_name, adventure_name):
-                if file_path.exists():
+                # 存在確認の stat を省き、無ければそのまま次へ
+                try:
                     file_path.unlink()
-                    deletion_log.append(f"Deleted: {file_path}")
+                except FileNotFoundError:
+                    continue
+                deletion_log.append(f"Deleted: {file_path}")
         return deletion_log
 
     def _get_adventure_files(self, area_name: str, adventure_name: str) -> List[Path]:
@@ -273,6 +479,14 @@ class FileHandler:
               for check_type in ['log', 'adv', 'loc']]
         ]
 
+    def list_area_dirs(self) -> Set[str]:
+        """データフォルダ直下のエリアフォルダ名を、1回の scandir でまとめて返す。"""
+        try:
+            with os.scandir(self.structure.data_dir) as entries:
+                return {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            return set()
+
     def area_exists(self, area_name: str) -> bool:
         area_path = self.get_area_path(area_name)
         area_csv = self.get_area_csv_path(area_name)
@@ -290,63 +504,64 @@ class FileHandler:
         return []
 
     def delete_folder(self, pth):
-        for sub in pth.iterdir():
-            if sub.is_dir():
-                self.delete_folder(sub)
-            else:
-                sub.unlink()
-        pth.rmdir()
-
-    def _delete_areas(self, areas: List[str]) -> Iterator[str]:
+        shutil.rmtree(pth)
+
+    def _build_area_graph(self) -> Dict[str, List[str]]:
+        """エリア名から次のエリア名のリストへの対応を、全 lv*.csv を1回走査して作ります。"""
+        def build() -> Dict[str, List[str]]:
+            graph: Dict[str, List[str]] = {}
+            for row in self._read_areas_rows():
+                next_area = row.get("次のエリア", "なし")
+                if next_area != "なし":
+                    graph.setdefault(row.get("エリア名"), []).append(next_area)
+            return graph
+
+        return self._mtime_cached("area_graph", self.get_all_areas_csv_path(), build)
+
+    def _delete_areas(self, areas: List[str], plan: Optional[DeletionPlan] = None, area_graph: Optional[Dict[str, List[str]]] = None) -> Iterator[str]:
+        own_plan = plan is None
+        plan = plan or DeletionPlan()
+        # 削除中はCSVを書き換えないので、エリアのつながりは最初に一度だけ読めばよい
+        if area_graph is None:
+            area_graph = self._build_area_graph()
+
         # 次のエリアが存在する場合、再帰的に削除する
         for area in areas:
-            next_areas = self.load_next_area_names(area)
+            next_areas = area_graph.get(area, [])
             if next_areas:
                 yield f"🔥 次のエリア: {next_areas}"
-                yield from self._delete_areas(next_areas)
+                yield from self._delete_areas(next_areas, plan, area_graph)
 
         # Delete adventures
         for area in areas:
             adventures = self.load_area_adventures(area)
-            yield from self._delete_adventures(area, adventures)
+            yield from self._delete_adventures(area, adventures, plan=plan)
 
         # Delete from areas CSV
         areas_csv_paths = self.get_all_areas_csv_path()
         for areas_csv_path in areas_csv_paths:
             if areas_csv_path.exists():
-                df_areas = pd.read_csv(areas_csv_path)
-                df_areas = df_areas[~df_areas["エリア名"].isin(areas)]
-                df_areas.to_csv(areas_csv_path, index=False)
-
+                plan.drop(areas_csv_path, "エリア名", areas)
                 # 該当エリアが次のエリアとなっている場合、なしに戻す
-                for area in areas:
-                    df_areas.loc[df_areas['次のエリア'] == area, '次のエリア'] = 'なし'
-                df_areas.to_csv(areas_csv_path, index=False)
+                plan.reset(areas_csv_path, "次のエリア", areas)
                 yield f"🔥 エリア一覧: {areas} in {areas_csv_path}"
         all_areas_check_csv_paths = self.get_all_areas_check_path()
         for areas_check_csv_path in all_areas_check_csv_paths:
             if areas_check_csv_path.exists():
-                df_all_areas_check = pd.read_csv(areas_check_csv_path)
                 # area_namesに含まれるいずれかの文字列が"エリア名"列に含まれる行を除外
-                pattern = '|'.join(areas)
-                df_all_areas_check = df_all_areas_check[~df_all_areas_check["エリア名"].str.contains(pattern, na=False)]
-                df_all_areas_check.to_csv(areas_check_csv_path, index=False)
+                plan.drop_matching(areas_check_csv_path, "エリア名", areas)
                 yield f"🔥 エリアチェック: {areas} from {areas_check_csv_path}"
         # Delete from area CSV
         for area in areas:
-            area_csv_path = self.get_area_csv_path(area)
-            area_path = self.get_area_path(area)
-            check_area_path = self.get_check_area_path(area)
-            if area_csv_path.exists():
-                area_csv_path.unlink()
-            if area_path.exists():
-                self.delete_folder(area_path)
-            if check_area_path.exists():
-                self.delete_folder(check_area_path)
-            yield f"🔥 エリア: {area}"
-
-    def _delete_adventures(self, area_name: str, adventures: List[str], prev_area_name: str = None, next_area_name: str = None) -> Iterator[str]:
-        prev_area_name = self.get_previous_adventure_name(area_name)
+            plan.remove_area(area)
+
+        if own_plan:
+            yield from self._apply_deletions(plan)
+
+    def _delete_adventures(self, area_name: str, adventures: List[str], prev_area_name: str = None, next_area_name: str = None, plan: Optional[DeletionPlan] = None) -> Iterator[str]:
+        own_plan = plan is None
+        plan = plan or DeletionPlan()
+        prev_area_name = self.get_previous_area_name(area_name)
         next_area_name = self.get_next_area_name(area_name)
 
         # 次の冒険が存在する場合、再帰的に削除する
@@ -354,98 +569,201 @@ class FileHandler:
             next_adventures = self.load_next_adventure_names(area_name, adventure)
             if next_adventures:
                 yield f"🔥 次の冒険: {next_adventures} from {next_area_name}"
-                yield from self._delete_adventures(next_area_name, next_adventures)
+                yield from self._delete_adventures(next_area_name, next_adventures, plan=plan)
 
         # Delete from area CSV
         area_csv_path = self.get_area_csv_path(area_name)
         if area_csv_path.exists():
-            df_area = pd.read_csv(area_csv_path)
-            df_area = df_area[~df_area["冒険名"].isin(adventures)]
-            df_area.to_csv(area_csv_path, index=False)
+            plan.drop(area_csv_path, "冒険名", adventures)
             yield f"🔥 冒険一覧: {adventures} from {area_name}"
 
         # Delete from previous area CSV
         if prev_area_name is not None:
             prev_area_csv_path = self.get_area_csv_path(prev_area_name)
             if prev_area_csv_path.exists():
-                df_prev_area = pd.read_csv(prev_area_csv_path)
                 # 該当の冒険が次の冒険となっている場合、なしに戻す
-                for adventure in adventures:
-                    df_prev_area.loc[df_prev_area['次の冒険'] == adventure, '次の冒険'] = 'なし'
-                df_prev_area.to_csv(prev_area_csv_path, index=False)
+                plan.reset(prev_area_csv_path, "次の冒険", adventures)
                 yield f"🔥 冒険一覧: {adventures} from {prev_area_name}"
 
         # Delete from adventure check CSV
         check_adv_path = self.get_check_path(area_name, "adv")
         if check_adv_path.exists():
-            df_check = pd.read_csv(check_adv_path)
-            df_check = df_check[~df_check["冒険名"].isin(adventures)]
-            df_check.to_csv(check_adv_path, index=False)
+            plan.drop(check_adv_path, "冒険名", adventures)
             yield f"🔥 冒険チェック: {adventures}"
 
         # Cascade delete logs and locations
-        yield from self._delete_logs(area_name, adventures)
+        yield from self._delete_logs(area_name, adventures, plan)
+
+        if own_plan:
+            yield from self._apply_deletions(plan)
+
+    def _delete_logs(self, area_name: str, adventures: List[str], plan: Optional[DeletionPlan] = None) -> Iterator[str]:
+        own_plan = plan is None
+        plan = plan or DeletionPlan()
 
-    def _delete_logs(self, area_name: str, adventures: List[str]) -> Iterator[str]:
-        # Delete log files
+        # Delete log files (フォルダを1回だけ走査し、存在するものだけ消す)
+        present = set(self._list_area_txt_stems(area_name))
         for adv in adventures:
-            log_path = self.get_adventure_path(area_name, adv)
-            if log_path.exists():
+            if adv in present:
+                log_path = self.get_adventure_path(area_name, adv)
                 log_path.unlink()
                 yield f"🔥 ログ: {log_path}"
 
         # Delete from log check CSV
         check_log_path = self.get_check_path(area_name, "log")
         if check_log_path.exists():
-            df_check = pd.read_csv(check_log_path)
-            df_check = df_check[~df_check["冒険名"].isin(adventures)]
-            df_check.to_csv(check_log_path, index=False)
+            plan.drop(check_log_path, "冒険名", adventures)
             yield f"🔥 ログチェック: {adventures}"
 
         # Cascade delete locations
-        yield from self._delete_locations(area_name, adventures)
+        yield from self._delete_locations(area_name, adventures, plan)
 
-    def _delete_locations(self, area_name: str, adventures: List[str]) -> Iterator[str]:
-        # Delete location files
+        if own_plan:
+            yield from self._apply_deletions(plan)
+
+    def _delete_locations(self, area_name: str, adventures: List[str], plan: Optional[DeletionPlan] = None) -> Iterator[str]:
+        own_plan = plan is None
+        plan = plan or DeletionPlan()
+
+        # Delete location files (フォルダを1回だけ走査し、存在するものだけ消す)
+        present = set(self._list_area_txt_stems(area_name))
         for adv in adventures:
-            loc_path = self.get_location_path(area_name, adv)
-            if loc_path.exists():
+            if f"loc_{adv}" in present:
+                loc_path = self.get_location_path(area_name, adv)
                 loc_path.unlink()
                 yield f"🔥 位置: {loc_path}"
 
         # Delete from location check CSV
         check_loc_path = self.get_check_path(area_name, "loc")
         if check_loc_path.exists():
-            df_check = pd.read_csv(check_loc_path)
-            df_check = df_check[~df_check["冒険名"].isin(adventures)]
-            df_check.to_csv(check_loc_path, index=False)
+            plan.drop(check_loc_path, "冒険名", adventures)
             yield f"🔥 位置チェック: {adventures}"
 
+        if own_plan:
+            yield from self._apply_deletions(plan)
+
+    def _apply_deletions(self, plan: DeletionPlan) -> Iterator[str]:
+        # フォルダごと消えるエリアのCSVは書き換えずに済ませる
+        # 消えるフォルダは集合にしておき、各CSVの親フォルダを順に引くだけで判定する
+        removed_dirs = {self.get_area_path(area) for area in plan.removed_areas}
+        removed_dirs |= {self.get_check_area_path(area) for area in plan.removed_areas}
+        paths = [
+            path for path in dict.fromkeys([*plan.drops, *plan.pattern_drops, *plan.resets])
+            if removed_dirs.isdisjoint(path.parents) and path.exists()
+        ]
+        if not paths and not plan.removed_areas:
+            return
+
+        # CSVの書き換えとエリアフォルダの削除はそれぞれ独立しているので並行して行う
+        with ThreadPoolExecutor(max_workers=min(8, len(paths) + len(plan.removed_areas))) as executor:
+            for _ in executor.map(lambda path: self._rewrite_for_deletion(path, plan), paths):
+                pass
+            futures = [executor.submit(self._remove_area_files, area) for area in plan.removed_areas]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _rewrite_for_deletion(self, path: Path, plan: DeletionPlan) -> None:
+        import pandas as pd
+
+        df = pd.read_csv(path)
+        # 削除条件は1つのマスクにまとめ、行の絞り込みと書き出しは最後に一度だけ行う
+        drop_mask = pd.Series(False, index=df.index)
+        for column, values in plan.drops.get(path, {}).items():
+            drop_mask |= df[column].isin(values)
+        for column, values in plan.pattern_drops.get(path, {}).items():
+            drop_mask |= df[column].str.contains('|'.join(map(re.escape, values)), na=False)
+        for column, values in plan.resets.get(path, {}).items():
+            df[column] = df[column].where(~df[column].isin(values), 'なし')
+        atomic_write_bytes(path, df[~drop_mask].to_csv(index=False).encode('utf-8'))
+
+    def _remove_area_files(self, area: str) -> str:
+        area_csv_path = self.get_area_csv_path(area)
+        area_path = self.get_area_path(area)
+        check_area_path = self.get_check_area_path(area)
+        # 存在確認の stat を省き、無ければそのまま次へ
+        area_csv_path.unlink(missing_ok=True)
+        for folder in (area_path, check_area_path):
+            try:
+                self.delete_folder(folder)
+            except FileNotFoundError:
+                pass
+        return f"🔥 エリア: {area}"
+
     def load_usage_data(self) -> dict:
         """
         使用履歴、アイテムインベントリ、収支情報をJSONファイルから読み込む。
         """
         user_data_file = USER_DATA_FILE
         try:
-            with user_data_file.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-                if "adventure_history" not in data: # 初回起動時などでキーが存在しない場合
-                    data["adventure_history"] = [] # 空のリストで初期化
-                if "inventory" not in data:
-                    data["inventory"] = []
-                if "balance" not in data:
-                    data["balance"] = 1000 # 初期所持金
-                data["adventure_history"].sort(key=lambda item: item["timestamp"], reverse=True)
-                return data
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"adventure_history": [], "inventory": [], "balance": 1000}
+            data = read_json(user_data_file)
+            if "adventure_history" not in data: # 初回起動時などでキーが存在しない場合
+                data["adventure_history"] = [] # 空のリストで初期化
+            if "inventory" not in data:
+                data["inventory"] = []
+            if "balance" not in data:
+                data["balance"] = 1000 # 初期所持金
+        except (FileNotFoundError, JSONDecodeError):
+            data = {"adventure_history": [], "inventory": [], "balance": 1000}
+        # まだまとめていない追記分（まとめる途中で残ったものも含む）を加える
+        entries = []
+        for path in [*self._staged_history_files(), HISTORY_LOG_FILE]:
+            try:
+                entries.extend(read_jsonl(path))
+            except FileNotFoundError:
+                pass
+        self._merge_history(data["adventure_history"], entries)
+        return data
 
     def save_usage_data(self, data: dict):
         """使用履歴、アイテムインベントリ、収支情報をJSONファイルへ保存する。"""
         user_data_file = USER_DATA_FILE
         user_data_file.parent.mkdir(parents=True, exist_ok=True)
-        with user_data_file.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 追記ファイルは消さずに別名へ移してから読む。読み込み後に他のセッションが追記した分は新しい追記ファイルに残る
+        try:
+            os.replace(HISTORY_LOG_FILE, HISTORY_LOG_FILE.with_name(f"history_log.{uuid.uuid4().hex}.staging.jsonl"))
+        except FileNotFoundError:
+            pass
+        staged_files = self._staged_history_files()
+        entries = []
+        for path in staged_files:
+            try:
+                entries.extend(read_jsonl(path))
+            except FileNotFoundError:
+                pass
+        self._merge_history(data.setdefault("adventure_history", []), entries)
+        write_json(user_data_file, data)
+        # 書き込んだ分だけを消す。消す前に落ちても、読み込み時に重複は取り除かれる
+        for path in staged_files:
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _staged_history_files() -> List[Path]:
+        # 古く移されたものから順に読む
+        paths = []
+        for path in HISTORY_LOG_FILE.parent.glob(HISTORY_STAGING_GLOB):
+            try:
+                paths.append((path.stat().st_mtime_ns, path))
+            except FileNotFoundError:
+                pass
+        return [path for _, path in sorted(paths)]
+
+    @staticmethod
+    def _merge_history(history: List[Dict], entries: List[Dict]) -> None:
+        """追記順の entries を、新しい順の history に重複なく加える。"""
+        def key(entry: Dict) -> tuple:
+            return entry.get("timestamp"), entry.get("area"), entry.get("adventure")
+
+        seen = {key(entry) for entry in history}
+        new_entries = []
+        # 後から追記したものほど新しいので、逆順にして先頭へ入れる
+        for entry in reversed(entries):
+            if key(entry) not in seen:
+                seen.add(key(entry))
+                new_entries.append(entry)
+        history[:0] = new_entries
+        # 同じ時刻どうしは安定ソートで今の並び（追記分が先）のまま残る
+        if any(a["timestamp"] < b["timestamp"] for a, b in zip(history, history[1:])):
+            history.sort(key=itemgetter("timestamp"), reverse=True)
 
     def get_items(self, selected_area: str, selected_adventure: str, selected_result: str) -> list:
         area_df = self.load_area_csv(selected_area)
@@ -456,22 +774,27 @@ class FileHandler:
             "失敗": "❌",
         }
         if area_df is not None and "アイテム" in area_df.columns:
-            # 選択された冒険の行をフィルタリング
-            adventure_row = area_df[area_df["冒険名"] == selected_adventure]
-            if not adventure_row.empty:
-                csv_items_str = adventure_row["アイテム"].iloc[0]
-                if isinstance(csv_items_str, str):
-                    item_value = self.config_manager.item_value_table.get(selected_result, 0)
-                    for item_name_str in csv_items_str.split(";"):
-                        item_name = result_emojis[selected_result] + " " + item_name_str.strip()
-                        if item_name:
-                            item_detail = {
-                                "name": item_name,
-                                "value": item_value,
-                            }
-                            items.append(item_detail)
+            # 選択された冒険の行のアイテムを取り出す
+            csv_items_str = self._lookup_frame(area_df, "冒険名", selected_adventure, "アイテム")
+            if isinstance(csv_items_str, str):
+                item_value = self.config_manager.item_value_table.get(selected_result, 0)
+                for item_name_str in csv_items_str.split(";"):
+                    item_name = result_emojis[selected_result] + " " + item_name_str.strip()
+                    if item_name:
+                        item_detail = {
+                            "name": item_name,
+                            "value": item_value,
+                        }
+                        items.append(item_detail)
         return items
 
+    def add_adventure_history(self, entry: Dict) -> None:
+        # 履歴全体を書き直さず1行だけ追記する。並べ替えは読み込み時に行う
+        HISTORY_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        append_jsonl(HISTORY_LOG_FILE, entry)
+        if HISTORY_LOG_FILE.stat().st_size >= HISTORY_COMPACT_BYTES:
+            self.save_usage_data(self.load_usage_data())
+
     def add_item_to_inventory(self, item: Dict) -> None:
         data = self.load_usage_data()
         inventory = data.get("inventory", [])
@@ -593,16 +916,8 @@ class FileHandler:
         if not text or not terms_dict:
             return text or ""
 
-        # 用語を長さ順にソートして、長い用語から先に置換する（部分一致防止）
-        sorted_terms = sorted(terms_dict.keys(), key=len, reverse=True)
-        
-        # 用語を正規表現パターンに変換し、重複を除去
-        patterns = list(dict.fromkeys(re.escape(term) for term in sorted_terms))
-        
-        # すべてのパターンを結合して一つの正規表現パターンを生成
-        combined_pattern = "|".join(patterns)
-
-        if not combined_pattern:
+        combined_pattern = self._terms_pattern(terms_dict)
+        if combined_pattern is None:
             return text
 
         def replace_func(match):
@@ -612,7 +927,25 @@ class FileHandler:
             # CSSでツールチップを表示するためのカスタム属性とクラスを設定
             return self.term_to_html(display_text or term, desc)
 
-        return re.sub(combined_pattern, replace_func, text)
+        return combined_pattern.sub(replace_func, text)
+
+    def _terms_pattern(self, terms_dict: Dict[str, str]) -> Optional["re.Pattern"]:
+        # 冒険ログは1行ずつ置換するので、同じ辞書なら並べ替えと結合は最初の1回だけにする
+        cached = self._terms_pattern_cache
+        if cached is not None and cached[0] is terms_dict and cached[1] == len(terms_dict):
+            return cached[2]
+
+        # 用語を長さ順にソートして、長い用語から先に置換する（部分一致防止）
+        sorted_terms = sorted(terms_dict.keys(), key=len, reverse=True)
+        
+        # 用語を正規表現パターンに変換し、重複を除去
+        patterns = list(dict.fromkeys(re.escape(term) for term in sorted_terms))
+        
+        # すべてのパターンを結合して一つの正規表現パターンを生成
+        combined_pattern = "|".join(patterns)
+        compiled = re.compile(combined_pattern) if combined_pattern else None
+        self._terms_pattern_cache = (terms_dict, len(terms_dict), compiled)
+        return compiled
     
     def term_to_html(self, term: str, desc: str) -> str:
         return f'<span class="tooltip-span" data-tooltip="{desc}" style="text-decoration: underline; color: #1E90FF; cursor: help;">{term}</span>'
@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+from typing import Any, List
+
+from src.utils.atomic_write import atomic_write_bytes
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson が無い環境でも同じ例外で扱えるよう、標準の JSONDecodeError を使う
+# (orjson.JSONDecodeError は json.JSONDecodeError のサブクラス)
+JSONDecodeError = json.JSONDecodeError
+
+
+def read_json(path: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path: Path, data: Any) -> None:
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    atomic_write_bytes(path, payload)
+
+
+def append_jsonl(path: Path, record: Any) -> None:
+    """1件を1行のJSONとしてファイル末尾に追記します。"""
+    if orjson is not None:
+        line = orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    else:
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    with path.open("ab") as f:
+        f.write(line)
+
+
+def read_jsonl(path: Path) -> List[Any]:
+    """append_jsonl で書いたファイルを読みます。書き込み途中で切れた末尾の行は読み飛ばします。"""
+    loads = orjson.loads if orjson is not None else json.loads
+    records = []
+    with path.open("rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                records.append(loads(line))
+            except JSONDecodeError:
+                continue
+    return records
@@ -1,8 +1,15 @@
+import threading
+import time
+import traceback
 from enum import Enum
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+LOG_BUFFER_SIZE = 8192
+# 前回の書き出しからこの秒数が過ぎていれば、次の行を書いたときに書き出す（tail -f で追えるように）
+LOG_FLUSH_INTERVAL = 1.0
+
 class LogLevel(Enum):
     INFO = "ℹ️"
     GENERATE = "💬"
@@ -15,8 +22,14 @@ class LogLevel(Enum):
 class Logger:
     def __init__(self, log_file: Optional[Path] = None):
         self.log_file = log_file
+        self._file = None
+        # 複数スレッドから呼ばれても1行ずつ書き込まれるようにする
+        self._lock = threading.Lock()
+        self._last_flush = float("-inf")
         if log_file:
             log_file.parent.mkdir(parents=True, exist_ok=True)
+            # 1行ごとに開き直さず、開いたままバッファに溜めて書き込む
+            self._file = log_file.open('a', encoding='utf-8', buffering=LOG_BUFFER_SIZE)
 
     def log(self, message: str, level: LogLevel = LogLevel.INFO) -> None:
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -25,9 +38,24 @@ class Logger:
         else:
             formatted_message = f"{timestamp} {level.value} {message}"
         print(formatted_message)
-        if self.log_file:
-            with self.log_file.open('a', encoding='utf-8') as f:
-                f.write(f"{formatted_message}\n")
+        # close() と同時に呼ばれても閉じたファイルに書かないよう、確認もロックの中で行う
+        with self._lock:
+            if self._file:
+                self._file.write(f"{formatted_message}\n")
+                now = time.monotonic()
+                # 警告・エラーは異常終了しても残るよう、すぐに書き出す
+                if level in (LogLevel.WARNING, LogLevel.ERROR) or now - self._last_flush >= LOG_FLUSH_INTERVAL:
+                    self._file.flush()
+                    self._last_flush = now
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def __del__(self):
+        self.close()
 
     def info(self, message: str) -> None:
         self.log(message, LogLevel.INFO)
@@ -44,6 +72,10 @@ class Logger:
     def error(self, message: str) -> None:
         self.log(message, LogLevel.ERROR)
 
+    def exception(self, message: str) -> None:
+        # except 節の中で呼び、処理中の例外のトレースバックも残す
+        self.log(f"{message}\n{traceback.format_exc().rstrip()}", LogLevel.ERROR)
+
     def delete(self, message: str) -> None:
         self.log(message, LogLevel.DELETE)
 
@@ -1,6 +1,21 @@
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from src.utils.json_io import JSONDecodeError, read_json, write_json
+
+STATUS_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Streamlit の再実行をまたいでも使えるよう、行数の判定結果はモジュールで保持する
+FILE_COMPLETE_CACHE_SIZE = 8192
+# エリアフォルダごとに、各テキストファイルの (更新時刻, サイズ, 完了したか) を残しておくファイル
+STATUS_SIDECAR_NAME = ".status.json"
+MIN_COMPLETE_LINES = 50
+LINE_COUNT_CHUNK_SIZE = 64 * 1024
+# エリアごとの (完了, チェック済み) を、関係するファイルの更新時刻とサイズと一緒に覚えておく
+_AREA_STATE_CACHE: Dict[str, Tuple[tuple, Tuple[bool, bool]]] = {}
 
 @dataclass
 class ProgressStatus:
@@ -19,6 +34,9 @@ class ProgressStatus:
 class ProgressTracker:
     def __init__(self, file_handler):
         self.file_handler = file_handler
+        # ビューアでは再実行ごとに作り直されるので、1回の描画の中だけで使い回す結果
+        self._area_state_memo: Dict[str, Tuple[bool, bool]] = {}
+        self._fingerprint_memo: Dict[str, tuple] = {}
 
     def is_area_complete(self, area: str) -> bool:
         area_csv = self.file_handler.get_area_csv_path(area)
@@ -26,23 +44,139 @@ class ProgressTracker:
             return False
             
         adventures = self.file_handler.load_area_adventures(area)
-        completed_count = sum(1 for adv in adventures 
-                            if self._is_file_complete(self.file_handler.get_adventure_path(area, adv)))
-        return completed_count == len(adventures)
+        # 冒険ごとに stat せず、エリアフォルダを1回だけ走査した結果を使う
+        # ログがまだない冒険があれば、stat や行数の確認をする前に打ち切る
+        log_names = [f"{adv}.txt" for adv in adventures]
+        completion = self._area_completion(self.file_handler.get_area_path(area), required=log_names)
+        if completion is None:
+            return False
+        return all(completion[name] for name in log_names)
+
+    def adventure_completion(self, area_name: str) -> Dict[str, bool]:
+        """エリア内の冒険名ごとに、冒険ログが完了しているかを返す。ログのない冒険は含まない。"""
+        completion = self._area_completion(self.file_handler.get_area_path(area_name))
+        return {
+            name[:-len(".txt")]: complete
+            for name, complete in completion.items()
+            if not name.startswith("loc_")
+        }
+
+    def _area_completion(self, area_path: Path, required: Optional[Iterable[str]] = None) -> Optional[Dict[str, bool]]:
+        """エリアフォルダ内の .txt ごとに完了しているかを返す。
+
+        サイドカーに記録した更新時刻とサイズが一致するファイルは読まずに済ませ、
+        変わっていたファイルだけ行数を数え直してサイドカーを書き直す。
+        required のファイルが1つでもなければ、stat する前に None を返す。
+        """
+        try:
+            entries = os.scandir(area_path)
+        except FileNotFoundError:
+            return None if required is not None else {}
+        with entries:
+            txt_entries = [entry for entry in entries if entry.name.endswith(".txt")]
+        if required is not None and not {entry.name for entry in txt_entries}.issuperset(required):
+            return None
+        txt_stats = {entry.name: entry.stat() for entry in txt_entries}
+
+        sidecar_path = area_path / STATUS_SIDECAR_NAME
+        recorded = self._read_sidecar(sidecar_path)
+        files = {}
+        completion = {}
+        for name, st in txt_stats.items():
+            record = recorded.get(name)
+            if record and record[0] == st.st_mtime_ns and record[1] == st.st_size:
+                complete = bool(record[2])
+            else:
+                complete = self._is_stat_complete(st, area_path / name)
+            files[name] = [st.st_mtime_ns, st.st_size, complete]
+            completion[name] = complete
+
+        if files != recorded:
+            try:
+                write_json(sidecar_path, {"min_lines": MIN_COMPLETE_LINES, "files": files})
+            except OSError:
+                pass
+        return completion
+
+    def _read_sidecar(self, sidecar_path: Path) -> Dict[str, list]:
+        try:
+            data = read_json(sidecar_path)
+        except (FileNotFoundError, JSONDecodeError):
+            return {}
+        # 完了とみなす行数が変わったら、記録は使わずに数え直す
+        if not isinstance(data, dict) or data.get("min_lines") != MIN_COMPLETE_LINES:
+            return {}
+        return data.get("files") or {}
+
+    def area_state(self, area: str) -> Tuple[bool, bool]:
+        """(冒険ログがすべて完了しているか, チェックまで済んでいるか) を返す。
+
+        エリアフォルダ・エリアCSV・チェックCSVが前回から変わっていなければ、
+        フォルダの走査やCSVの読み込みをせずに前回の結果を返す。
+        """
+        # サイドバーとエリア一覧で同じエリアを聞かれても、stat するのは最初の1回だけにする
+        state = self._area_state_memo.get(area)
+        if state is not None:
+            return state
+        key = os.fspath(self.file_handler.get_area_path(area))
+        fingerprint = self._area_fingerprint(area)
+        cached = _AREA_STATE_CACHE.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            state = cached[1]
+        else:
+            complete = self.is_area_complete(area)
+            state = (complete, complete and self.is_area_all_checked(area))
+            _AREA_STATE_CACHE[key] = (fingerprint, state)
+        self._area_state_memo[area] = state
+        return state
+
+    def area_exists(self, area: str) -> bool:
+        """エリアフォルダとエリアCSVがあるか。area_state と同じ stat 結果を使い、描画中に同じパスを2度 stat しない。"""
+        area_dir, area_csv = self._area_fingerprint(area)[:2]
+        return area_dir is not None and area_csv is not None
+
+    def _area_fingerprint(self, area: str) -> tuple:
+        fingerprint = self._fingerprint_memo.get(area)
+        if fingerprint is None:
+            fingerprint = self._fingerprint_memo[area] = self._stat_area_files(area)
+        return fingerprint
+
+    def _stat_area_files(self, area: str) -> tuple:
+        paths = (
+            self.file_handler.get_area_path(area),
+            self.file_handler.get_area_csv_path(area),
+            self.file_handler.get_check_path(area, "adv"),
+            self.file_handler.get_check_path(area, "log"),
+            self.file_handler.get_check_path(area, "loc"),
+        )
+        fingerprint = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                fingerprint.append(None)
+            else:
+                fingerprint.append((st.st_mtime_ns, st.st_size))
+        return tuple(fingerprint)
 
     def is_area_all_checked(self, area: str) -> bool:
         check_log = self.file_handler.get_check_path(area, "log")
         check_adv = self.file_handler.get_check_path(area, "adv")
         check_loc = self.file_handler.get_check_path(area, "loc")
 
+        # チェックファイルの有無を先に見て、ログの行数を数える前に打ち切る
+        if not all(path.exists() for path in [check_log, check_adv, check_loc]):
+            return False
         area_status = self.get_area_status(area)
-        if all(path.exists() for path in [check_log, check_adv, check_loc]) and area_status.completion_ratio == 1.0 and area_status.check_ratio == 1.0:
-            return True
+        return area_status.completion_ratio == 1.0 and area_status.check_ratio == 1.0
+
+    def pending_areas(self, area_names: Iterable[str]) -> Iterator[str]:
+        for area in area_names:
+            if not self.is_area_all_checked(area) or not self.is_area_complete(area):
+                yield area
 
     def get_area_status(self, area_name: str) -> ProgressStatus:
-        adventure_files = self._count_adventure_files(area_name)
-        check_files = self._count_check_files(area_name)
-        completed_files = self._count_completed_files(area_name)
+        adventure_files, _, completed_files, check_files = self._scan_area(area_name)
         
         return ProgressStatus(
             total=adventure_files,
@@ -51,24 +185,30 @@ class ProgressTracker:
         )
 
     def get_all_areas_status(self) -> Dict[str, ProgressStatus]:
-        return {
-            area.name: self.get_area_status(area.name)
-            for area in self.file_handler.get_area_path().iterdir()
-            if area.is_dir()
-        }
-
-    def _count_adventure_files(self, area_name: str) -> int:
-        area_path = self.file_handler.get_area_path(area_name)
-        return len(list(f for f in area_path.glob("*.txt") if not f.name.startswith("loc_")))
-
-    def _count_check_files(self, area_name: str) -> int:
-        area_path = self.file_handler.get_area_path(area_name)
-        return len(list(f for f in area_path.glob("*.txt") if f.name.startswith("loc_") and self._is_file_complete(f)))
+        # DirEntry.is_dir() はディレクトリ読み込み時の情報を使うので、エリアごとの stat は発生しない
+        try:
+            with os.scandir(self.file_handler.get_areas_dir()) as entries:
+                area_names = [entry.name for entry in entries if entry.is_dir()]
+        except FileNotFoundError:
+            return {}
+        if not area_names:
+            return {}
+        # エリアごとの走査はファイルI/Oが中心で互いに独立しているので、並行して行う
+        with ThreadPoolExecutor(max_workers=min(STATUS_MAX_WORKERS, len(area_names))) as executor:
+            return dict(zip(area_names, executor.map(self.get_area_status, area_names)))
 
-    def _count_completed_files(self, area_name: str) -> int:
-        area_path = self.file_handler.get_area_path(area_name)
-        return len([f for f in area_path.glob("*.txt") 
-                   if not f.name.startswith("loc_") and self._is_file_complete(f)])
+    def _scan_area(self, area_name: str) -> Tuple[int, int, int, int]:
+        """エリアフォルダを1回だけ走査し、(冒険ログ数, 位置ファイル数, 完了した冒険ログ数, 完了した位置ファイル数) を返す。"""
+        adventure_files = loc_files = completed_adventures = completed_locs = 0
+        completion = self._area_completion(self.file_handler.get_area_path(area_name))
+        for name, complete in completion.items():
+            if name.startswith("loc_"):
+                loc_files += 1
+                completed_locs += complete
+            else:
+                adventure_files += 1
+                completed_adventures += complete
+        return adventure_files, loc_files, completed_adventures, completed_locs
 
     def is_adventure_complete(self, area_name: str, adventure_name: str) -> bool:
         adventure_path = self.file_handler.get_adventure_path(area_name, adventure_name)
@@ -88,8 +228,48 @@ class ProgressTracker:
         return True
 
 
-    def _is_file_complete(self, file_path: Path, min_lines: int = 50) -> bool:
-        if not file_path.exists():
+    def _is_file_complete(self, file_path: Path, min_lines: int = MIN_COMPLETE_LINES) -> bool:
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
             return False
-        with file_path.open('r', encoding='utf-8') as f:
-            return len(f.readlines()) >= min_lines
\ No newline at end of file
+        return self._is_stat_complete(st, file_path, min_lines)
+
+    def _is_stat_complete(self, st, file_path, min_lines: int = MIN_COMPLETE_LINES) -> bool:
+        if st is None:
+            return False
+        # 1行は最低1バイトなので、それより小さいファイルは読むまでもない
+        if st.st_size < min_lines:
+            return False
+        # 更新時刻とサイズが変わっていなければ、前回数えた結果を使う
+        return _has_min_lines(os.fspath(file_path), st.st_mtime_ns, st.st_size, min_lines)
+
+
+@lru_cache(maxsize=FILE_COMPLETE_CACHE_SIZE)
+def _has_min_lines(path: str, mtime_ns: int, size: int, min_lines: int) -> bool:
+    """ファイルを先頭からまとめて読み、改行を min_lines 個数えた時点で打ち切る。mtime_ns と size はキャッシュのキー。"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return False
+    try:
+        # 改行は UTF-8 でも b'\n' 1バイトなので、デコードせずにバイト列のまま数える
+        count = 0
+        last = b""
+        while chunk := os.read(fd, LINE_COUNT_CHUNK_SIZE):
+            count += chunk.count(b'\n')
+            if count >= min_lines:
+                return True
+            last = chunk
+        # readlines() と同じく、末尾に改行のない最終行も1行として数える
+        if last and last[-1:] != b'\n':
+            count += 1
+        return count >= min_lines
+    finally:
+        os.close(fd)
+
+
+def clear_progress_cache() -> None:
+    """「データ更新」などで、覚えている判定結果をすべて捨てる。"""
+    _AREA_STATE_CACHE.clear()
+    _has_min_lines.cache_clear()
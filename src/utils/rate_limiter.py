@@ -0,0 +1,60 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.base_refill_rate = refill_rate
+        self.available = capacity
+        self.updated_at = time.monotonic()
+        self.penalized_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.penalized_until and now >= self.penalized_until:
+            self.refill_rate = self.base_refill_rate
+            self.penalized_until = 0.0
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def acquire(self, cost: float = 1) -> None:
+        """cost 分のトークンを予約し、足りなければ補充されるまで待機する。"""
+        cost = min(cost, self.capacity)
+        with self.lock:
+            self._refill(time.monotonic())
+            wait = (cost - self.available) / self.refill_rate if self.available < cost else 0
+            self.available -= cost
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalize(self, cooldown: float) -> None:
+        """cooldown 秒のあいだ補充速度を半分に落とす。"""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.refill_rate = self.base_refill_rate / 2
+            self.penalized_until = time.monotonic() + cooldown
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0, penalty_cooldown: float = 60 * 5):
+        self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60) if tokens_per_minute else None
+        self.penalty_cooldown = penalty_cooldown
+
+    @classmethod
+    def from_config(cls, config_manager) -> "RateLimiter":
+        return cls(config_manager.requests_per_minute, config_manager.tokens_per_minute)
+
+    def acquire(self, estimated_tokens: Optional[int] = None) -> None:
+        if self.request_bucket:
+            self.request_bucket.acquire(1)
+        if self.token_bucket and estimated_tokens:
+            self.token_bucket.acquire(estimated_tokens)
+
+    def penalize(self) -> None:
+        for bucket in (self.request_bucket, self.token_bucket):
+            if bucket:
+                bucket.penalize(self.penalty_cooldown)
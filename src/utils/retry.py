@@ -1,7 +1,9 @@
 from functools import wraps
 import time
+import random
+import re
 import traceback
-from typing import Callable, TypeVar, Any
+from typing import Callable, Optional, TypeVar, Any
 
 
 T = TypeVar('T')
@@ -15,15 +17,46 @@ class RetryLimitExeeded(Exception):
 class EmptyResponseError(Exception):
     pass
 
-def retry_on_failure(max_retries: int = 10, wait_time: int = 60) -> Callable:
+RATE_LIMIT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+RATE_LIMIT_MARKERS = ("Rate limit", "RESOURCE_EXHAUSTED")
+# メッセージ中のHTTPステータスコードは1回の走査で取り出し、集合で判定する
+# (単語境界で区切るので "15000 tokens" のような数字の一部には反応しない)
+_STATUS_CODE_RE = re.compile(r"\b([45]\d\d)\b")
+
+
+def is_rate_limited(message: str) -> bool:
+    if any(marker in message for marker in RATE_LIMIT_MARKERS):
+        return True
+    return any(int(code) in RATE_LIMIT_STATUS_CODES for code in _STATUS_CODE_RE.findall(message))
+
+DEFAULT_MAX_RETRIES = 10
+# レート制限での1回の待機の上限（秒）
+RATE_LIMIT_MAX_SLEEP = 60
+
+
+def _resolve_max_retries(args: tuple) -> int:
+    # デコレータはクラス定義時に評価されるので、設定の MAX_RETRIES は呼び出し時に self.config から読む
+    config = getattr(args[0], "config", None) if args else None
+    return getattr(config, "max_retries", DEFAULT_MAX_RETRIES)
+
+def retry_on_failure(max_retries: Optional[int] = None, wait_time: int = 60, max_rate_limit_wait: int = 60 * 15,
+                     on_rate_limit: Optional[Callable[..., None]] = None) -> Callable:
+    """失敗時に再試行する。
+
+    max_retries を省略すると、呼び出し時に self.config.max_retries（なければ10）を使う。
+    レート制限による再試行は回数に数えず、待機の合計が max_rate_limit_wait 秒に達するまで続ける。
+    on_rate_limit は待機の前に元の関数と同じ引数で呼ばれる（レートリミッタの減速など）。
+    """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
+            retries = max_retries if max_retries is not None else _resolve_max_retries(args)
             backoff = max(wait_time, 10)
-            waited = 0
-            max_total_wait = 60 * 15
+            rate_limit_delay = 1.0
+            rate_limit_waited = 0.0
+            attempt = 0
             last_exc: Exception | None = None
-            for attempt in range(1, max_retries + 1):
+            while attempt < retries:
                 try:
                     response = func(*args, **kwargs)
                     if response is None:
@@ -32,21 +65,26 @@ def retry_on_failure(max_retries: int = 10, wait_time: int = 60) -> Callable:
                 except Exception as e:
                     last_exc = e
                     msg = str(e)
-                    if any(err in msg for err in ["408", "429", "Rate limit", "RESOURCE_EXHAUSTED", "500", "502", "503", "504"]):
-                        if waited >= max_total_wait:
+                    if isinstance(e, RateLimitExeeded) or is_rate_limited(msg):
+                        remaining = max_rate_limit_wait - rate_limit_waited
+                        if remaining <= 0:
                             raise RateLimitExeeded("Rate limit exceeded") from e
-                        sleep_for = min(backoff, 60, max_total_wait - waited)
-                        print(f"⏳ retry {attempt}/{max_retries}: rate-limited, waiting {sleep_for}s (total {waited + sleep_for}s)")
+                        if on_rate_limit is not None:
+                            on_rate_limit(*args, **kwargs)
+                        # decorrelated jitter: 前回の待機時間の3倍までの範囲でランダムに待つ
+                        rate_limit_delay = min(RATE_LIMIT_MAX_SLEEP, random.uniform(1.0, rate_limit_delay * 3))
+                        sleep_for = min(rate_limit_delay, remaining)
+                        print(f"⏳ rate-limited, waiting {sleep_for:.1f}s (total {rate_limit_waited + sleep_for:.0f}/{max_rate_limit_wait}s)")
                         time.sleep(sleep_for)
-                        waited += sleep_for
-                        backoff = min(backoff * 2, 60)
+                        rate_limit_waited += sleep_for
                         continue
-                    print(f"❌ {attempt}/{max_retries}: {traceback.format_exc()}")
-                    if attempt < max_retries:
+                    attempt += 1
+                    print(f"❌ {attempt}/{retries}: {traceback.format_exc()}")
+                    if attempt < retries:
                         time.sleep(backoff)
                         backoff = min(backoff * 2, 60)
                     else:
                         raise
-            raise RetryLimitExeeded(f"❌ {attempt}/{max_retries}: リトライ回数上限に達しました。") from last_exc
+            raise RetryLimitExeeded(f"❌ {attempt}/{retries}: リトライ回数上限に達しました。") from last_exc
         return wrapper
     return decorator
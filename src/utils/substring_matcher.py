@@ -0,0 +1,43 @@
+import re
+from typing import Iterable, Optional
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    # google-re2 があれば、語数が多くても入力長に比例した時間で終わる DFA の正規表現を使う
+    import re2 as regex_engine
+except ImportError:
+    regex_engine = re
+
+
+class SubstringMatcher:
+    """NGワードや既存の名前などの語の集合を前処理しておき、本文を1回走査するだけで含まれているかを調べる。"""
+
+    def __init__(self, words: Iterable[str]):
+        words = sorted({word for word in words if word}, key=len, reverse=True)
+        self._automaton = None
+        self._pattern = None
+        if not words:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for word in words:
+                self._automaton.add_word(word, word)
+            self._automaton.make_automaton()
+        else:
+            # pyahocorasick が無い環境では、長い語を優先した正規表現の選択で代用する
+            self._pattern = regex_engine.compile("|".join(map(re.escape, words)))
+
+    def find(self, text: str) -> Optional[str]:
+        """text に含まれる最初の語を返す。含まれていなければ None。"""
+        if self._automaton is not None:
+            for _, word in self._automaton.iter(text):
+                return word
+            return None
+        if self._pattern is not None:
+            match = self._pattern.search(text)
+            return match.group() if match else None
+        return None
@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.utils.csv_handler import CSVHandler
+
+try:
+    import pandas  # noqa: F401
+except ImportError:
+    pandas = None
+
+
+class ReadAdventuresTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_empty_file_yields_nothing(self):
+        path = self.dir / "area.csv"
+        path.write_text("", encoding="utf-8")
+        self.assertEqual(list(CSVHandler().read_adventures(path)), [])
+
+
+@unittest.skipIf(pandas is None, "pandas が必要")
+class ReadRowsFastTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, text: str) -> Path:
+        path = self.dir / "area.csv"
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_empty_file_returns_no_rows(self):
+        path = self._write("")
+        self.assertEqual(CSVHandler().read_rows_fast(path), [])
+        self.assertEqual(CSVHandler().read_rows_fast(path, usecols=["冒険名"]), [])
+
+    def test_header_only_file_returns_no_rows(self):
+        path = self._write("冒険名,結果\n")
+        self.assertEqual(CSVHandler().read_rows_fast(path, usecols=["冒険名"]), [])
+
+    def test_missing_column_is_skipped(self):
+        path = self._write("エリア名,結果\na,成功\n")
+        rows = CSVHandler().read_rows_fast(path, usecols=["冒険名"])
+        self.assertFalse(any("冒険名" in row for row in rows))
+
+    def test_missing_file_returns_no_rows(self):
+        self.assertEqual(CSVHandler().read_rows_fast(self.dir / "none.csv"), [])
+
+    def test_blank_cells_are_empty_strings(self):
+        path = self._write("冒険名,結果\na,\n")
+        self.assertEqual(CSVHandler().read_rows_fast(path), [{"冒険名": "a", "結果": ""}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from src.utils import csv_handler  # noqa: F401  src.generators より先に読み込んで循環importを避ける
+from src.generators.log import LogGenerator
+
+CAVE = """{name}は松明を掲げて洞窟の奥へ進んだ。
+湿った岩壁に水滴が落ちる音だけが響いていた。
+やがて足元に古びた宝箱が見えてきた。
+"""
+
+CAVE_NEXT = """{name}は宝箱の前に膝をつき、松明を岩壁に立てかけた。
+錆びた留め金を外すと、洞窟の冷気が蓋の隙間から漏れた。
+中には青く光るクリスタルが収まっていた。
+"""
+
+HARBOUR = """港の市場は朝から賑わっていた。
+魚売りの声が響き、{name}は人混みをかき分けて歩いた。
+露店の主人が新鮮な果物を差し出してきた。
+"""
+
+
+class IsContinuousTest(unittest.TestCase):
+    def test_continuing_chapter_is_accepted(self):
+        self.assertTrue(LogGenerator.is_continuous(CAVE, CAVE_NEXT))
+
+    def test_unrelated_chapter_is_rejected(self):
+        # 文末の「た。」などは共通でも、内容語が重ならなければつながっていない
+        self.assertFalse(LogGenerator.is_continuous(CAVE, HARBOUR))
+        self.assertFalse(LogGenerator.is_continuous(HARBOUR, CAVE))
+
+    def test_placeholders_do_not_count_as_overlap(self):
+        self.assertFalse(LogGenerator.is_continuous("{name}は歩いた。\n", "{name}は走った。\n"))
+
+    def test_empty_content_is_rejected(self):
+        self.assertFalse(LogGenerator.is_continuous("", CAVE_NEXT))
+
+
+if __name__ == "__main__":
+    unittest.main()
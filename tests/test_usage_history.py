@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.utils.file_handler import FileHandler, FileStructure, HISTORY_LOG_FILE, USER_DATA_FILE
+from src.utils.json_io import append_jsonl, read_json, write_json
+
+
+def _entry(timestamp: str, adventure: str) -> dict:
+    return {"timestamp": timestamp, "area": "エリア", "adventure": adventure, "adventurer": "a"}
+
+
+class UsageHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        # 履歴ファイルはカレントディレクトリからの相対パス
+        os.chdir(self.tmp.name)
+        root = Path(self.tmp.name)
+        self.handler = FileHandler(FileStructure(root / "data", root / "check", root / "prompt"), None)
+        USER_DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_new_entry_comes_first_on_same_timestamp(self):
+        write_json(USER_DATA_FILE, {"adventure_history": [_entry("2024-01-01 10:00:00", "古い冒険")]})
+        append_jsonl(HISTORY_LOG_FILE, _entry("2024-01-01 10:00:00", "新しい冒険"))
+        history = self.handler.load_usage_data()["adventure_history"]
+        self.assertEqual([e["adventure"] for e in history], ["新しい冒険", "古い冒険"])
+
+    def test_log_left_after_save_is_not_duplicated(self):
+        append_jsonl(HISTORY_LOG_FILE, _entry("2024-01-01 10:00:00", "冒険1"))
+        data = self.handler.load_usage_data()
+        write_json(USER_DATA_FILE, data)  # 追記ファイルを消す前に落ちた状態
+        history = self.handler.load_usage_data()["adventure_history"]
+        self.assertEqual(len(history), 1)
+
+    def test_entry_appended_after_load_survives_save(self):
+        append_jsonl(HISTORY_LOG_FILE, _entry("2024-01-01 10:00:00", "冒険1"))
+        data = self.handler.load_usage_data()
+        # 読み込んでから保存するまでに、別のセッションが追記する
+        append_jsonl(HISTORY_LOG_FILE, _entry("2024-01-01 10:05:00", "冒険2"))
+        self.handler.save_usage_data(data)
+        saved = read_json(USER_DATA_FILE)["adventure_history"]
+        self.assertEqual([e["adventure"] for e in saved], ["冒険2", "冒険1"])
+        self.assertFalse(HISTORY_LOG_FILE.exists())
+        self.assertEqual(list(HISTORY_LOG_FILE.parent.glob("*.staging.jsonl")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()